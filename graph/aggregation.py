@@ -0,0 +1,121 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from graph.results_store import ResultsStore
+
+MODEL_SHORT_NAMES = {
+    "models/encoders/twitter-roberta-base-sentiment-latest": "sentiment",
+    "unitary/toxic-bert": "toxicity",
+    "j-hartmann/emotion-english-distilroberta-base": "emotion",
+    "cardiffnlp/twitter-roberta-base-irony": "irony",
+    "cointegrated/roberta-base-formality": "formality",
+    "GroNLP/mdebertav3-subjectivity-english": "objectivity",
+    "IDA-SERICS/PropagandaDetection": "propaganda"
+}
+
+FIXED_LABELS = {
+    "formality": "formal",
+    "irony": "irony",
+    "propaganda": "propaganda",
+    "objectivity": "objective"
+}
+
+SKETCH_BINS = 100
+
+
+class RunningStats:
+    """
+    Running count, mean and variance (Welford/Chan) of one table cell, plus a
+    fixed-bin histogram over [0, 1] used as a quantile sketch (error <= 1/SKETCH_BINS).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._histogram = np.zeros(SKETCH_BINS, dtype=np.int64)
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if not n:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+        bins = np.clip((values * SKETCH_BINS).astype(np.int64), 0, SKETCH_BINS - 1)
+        self._histogram += np.bincount(bins, minlength=SKETCH_BINS)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = np.cumsum(self._histogram)
+        b = int(np.searchsorted(cumulative, target))
+        b = min(b, SKETCH_BINS - 1)
+        previous = cumulative[b - 1] if b else 0
+        in_bin = self._histogram[b]
+        fraction = (target - previous) / in_bin if in_bin else 0.0
+        return (b + min(max(fraction, 0.0), 1.0)) / SKETCH_BINS
+
+
+class ResultsAggregator:
+    """
+    Per language x model x label running statistics, updated as analyzer results
+    arrive. Building the results table costs O(1) per cell, independent of the
+    number of articles, so it can be redrawn live during long runs.
+    """
+
+    def __init__(self, count_duplicates: bool = True):
+        self.count_duplicates = count_duplicates
+        self.cells: Dict[str, Dict[str, Dict[str, RunningStats]]] = {}
+        self._lock = threading.Lock()
+
+    def add_store(self, store: Optional[ResultsStore]) -> None:
+        if store is None:
+            return
+        with self._lock:
+            for model, block in store.blocks.items():
+                model_short = MODEL_SHORT_NAMES.get(model, model)
+                fixed = FIXED_LABELS.get(model_short)
+                keep = np.ones(len(block.article_idx), dtype=bool)
+                if not self.count_duplicates:
+                    keep &= block.duplicate_of < 0
+
+                for language_idx in np.unique(block.language_idx[keep]):
+                    rows = block.probs[keep & (block.language_idx == language_idx)]
+                    lang_cells = self.cells.setdefault(store.language_table[language_idx], {})
+                    model_cells = lang_cells.setdefault(model_short, {})
+                    for col, label in enumerate(block.labels):
+                        if fixed is not None and label != fixed:
+                            continue
+                        model_cells.setdefault(label, RunningStats()).update(rows[:, col])
+                    if fixed is not None and fixed not in block.labels:
+                        model_cells.setdefault(fixed, RunningStats()).update(np.zeros(len(rows)))
+
+    def table(self) -> Dict[str, Dict[str, List[Tuple[str, float]]]]:
+        """{language: {model: [(label, mean), ...]}} sorted by mean; emotion keeps its top two labels."""
+        final_data = {}
+        with self._lock:
+            for lang, model_cells in self.cells.items():
+                final_data[lang] = {}
+                for model, label_cells in model_cells.items():
+                    label_avg = sorted(((lbl, s.mean) for lbl, s in label_cells.items()), key=lambda x: x[1], reverse=True)
+                    if model not in FIXED_LABELS and model != "sentiment":
+                        label_avg = label_avg[:2]
+                    final_data[lang][model] = label_avg
+        return final_data
+
+    def stats(self, lang: str, model: str, label: str) -> Optional[RunningStats]:
+        return self.cells.get(lang, {}).get(model, {}).get(label)
@@ -0,0 +1,126 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from graph.checkpointing import new_run_id
+from graph.fetcher import AsyncFetcher
+from graph.graph_builder import ANALYZER_NODES, AnalyzerSlots, analyzer_concurrency
+from graph.nodes.display_results_node import display_results_node
+from graph.nodes.save_final_state_node import save_final_state_node
+from graph.nodes.scrape_node import scrape_node_factory
+from graph.nodes.translate_to_en_node import translate_to_en_node
+from graph.nodes.translate_to_multiple_node import translate_queries
+from graph.results_store import ResultsStore, merge_results
+from graph.service import parse_job_request
+from graph.state_definitions import GraphState, new_run_state
+from graph.streaming import DEFAULT_SCRAPE_WORKERS
+from graph.tracing import traced_node
+
+
+def load_topics(path: str, default_languages: Optional[List[str]] = None, default_articles: int = 3) -> List[dict]:
+    """
+    Reads a topics file. Every non-empty line that is not a '#' comment is either a
+    JSON object {"topic": ..., "languages": [...] or "en,pl", "articles": N} or a
+    plain topic, which uses default_languages and default_articles.
+    """
+    topics = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line) if line.startswith("{") else {"topic": line}
+            entry.setdefault("languages", default_languages or [])
+            entry.setdefault("articles", default_articles)
+            try:
+                topics.append(parse_job_request(entry))
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from None
+    return topics
+
+
+def topic_key(index: int) -> str:
+    return f"t{index:02d}"
+
+
+def run_batch(
+    topics: List[dict],
+    scrape_workers: int = DEFAULT_SCRAPE_WORKERS,
+    count_duplicates: bool = True
+) -> List[GraphState]:
+    """
+    Runs several topics as one pipeline and returns their final states:
+    - the queries of all topics are translated in one batched generate call
+    - all (topic, language) searches share one fetcher and one pool of scrape workers
+    - the articles of all topics are translated and analyzed as one article set
+    Every topic then gets its own run directory and HTML table, as a single run would.
+    Article IDs are prefixed with the topic key (e.g. 't01-pl-0003'), so they stay unique.
+    """
+    states: List[GraphState] = [
+        new_run_state(
+            f"{new_run_id(t['topic'])}-{topic_key(i)}", t["topic"], t["languages"], t["num_articles"],
+            count_duplicates=count_duplicates and t.get("count_duplicates", True)
+        )
+        for i, t in enumerate(topics)
+    ]
+
+    # --- Queries: one translation batch for every topic and language ---
+    print(f"\n🌍 Translating the queries of {len(states)} topics")
+    rows = [(s["input_text"][0]["text"], lang) for s in states for lang in s["selected_languages"] if lang != "en"]
+    translations = traced_node("translate_to_many", translate_queries)(rows)
+    for state in states:
+        topic = state["input_text"][0]["text"]
+        state["input_text"] = state["input_text"] + [
+            {"language": lang, "text": translations[(topic, lang)]} for lang in state["selected_languages"] if lang != "en"
+        ]
+
+    # --- Scraping: one fetcher, one worker pool for all topics ---
+    fetcher = AsyncFetcher()
+
+    def scrape(index: int, lang: str) -> list:
+        update = traced_node(f"scrape_{lang}", scrape_node_factory(lang, fetcher=fetcher))(states[index])
+        return [{**a, "article_id": f"{topic_key(index)}-{a['article_id']}"} for a in update.get("raw_articles", [])]
+
+    raw_articles = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, scrape_workers)) as pool:
+            futures = [pool.submit(scrape, i, lang) for i, state in enumerate(states) for lang in state["selected_languages"]]
+            # Collected in submission order: per topic, languages in the order of a single run
+            for future in futures:
+                raw_articles.extend(future.result())
+    finally:
+        fetcher.close()
+
+    # --- Translation to English and analysis over the combined article set ---
+    update = traced_node("translate_articles", translate_to_en_node)({"raw_articles": raw_articles, "translated_articles": []})
+    translated_articles = update.get("translated_articles", [])
+    duplicates = update.get("duplicates", {})
+
+    combined = {"translated_articles": translated_articles, "duplicates": duplicates, "results": ResultsStore()}
+    limiter = AnalyzerSlots(analyzer_concurrency(len(ANALYZER_NODES)))
+
+    def analyze(name: str, node_fn) -> ResultsStore:
+        with limiter:
+            return traced_node(name, node_fn)(combined).get("results", ResultsStore())
+
+    results = ResultsStore()
+    with ThreadPoolExecutor(max_workers=len(ANALYZER_NODES)) as pool:
+        for store in pool.map(lambda item: analyze(*item), ANALYZER_NODES):
+            results = merge_results(results, store)
+
+    # --- Split per topic: state file and HTML table for every topic ---
+    for i, state in enumerate(states):
+        prefix = f"{topic_key(i)}-"
+        state["raw_articles"] = [a for a in raw_articles if a["article_id"].startswith(prefix)]
+        state["translated_articles"] = [a for a in translated_articles if a["article_id"].startswith(prefix)]
+        article_ids = {a["article_id"] for a in state["translated_articles"]}
+        # Near-duplicates of another topic's article count as originals within this topic
+        state["duplicates"] = {a: c for a, c in duplicates.items() if a in article_ids and c in article_ids}
+        state["results"] = results.subset(article_ids)
+
+        print(f"\n📰 Topic {i + 1}/{len(states)}: {state['input_text'][0]['text']}")
+        save_final_state_node(state)
+        display_results_node(state)
+
+    return states
@@ -0,0 +1,46 @@
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+DEFAULT_CHECKPOINT_PATH = "output/checkpoints.sqlite"
+
+
+def open_checkpointer(path: str = DEFAULT_CHECKPOINT_PATH) -> "SqliteSaver":
+    """
+    SQLite checkpointer for the compiled graph. State is written after every
+    superstep, so a crashed run can be resumed with its run ID.
+    """
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # ResultsStore is a dataclass holding NumPy arrays; allow it to be restored from msgpack
+    serde = JsonPlusSerializer(allowed_msgpack_modules=[
+        ("graph.results_store", "ResultsStore"),
+        ("graph.results_store", "ModelBlock")
+    ])
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False), serde=serde)
+
+
+def new_run_id(topic: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", topic).strip("-")[:40] or "run"
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{slug}"
+
+
+def run_config(run_id: str) -> dict:
+    return {"configurable": {"thread_id": run_id}}
+
+
+def load_run_state(checkpointer: "SqliteSaver", run_id: str) -> Optional[dict]:
+    """Returns the latest saved state of run_id, or None if the run is unknown."""
+    checkpoint = checkpointer.get_tuple(run_config(run_id))
+    if checkpoint is None:
+        return None
+    return dict(checkpoint.checkpoint["channel_values"])
@@ -0,0 +1,175 @@
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from graph.results_store import ResultsStore
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, k: int = 5) -> set:
+    """
+    Word k-shingles of the lowercased text. Texts written without spaces
+    (e.g. Chinese, Japanese) fall back to character k-grams.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) >= 4 * k:
+        return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    chars = "".join(words)
+    return {chars[i:i + k] for i in range(max(1, len(chars) - k + 1))}
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures with LSH banding. add() returns the key of an already
+    indexed text whose estimated Jaccard similarity is at least `threshold`,
+    or None when the text is new (it is then indexed under `key`).
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(1)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+        self._buckets: List[Dict[Tuple[int, ...], List[str]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[str, List[int]] = {}
+
+    def signature(self, text: str) -> List[int]:
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(text)]
+        return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._perms]
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        sig = self.signature(text)
+        bands = [tuple(sig[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+        candidates = []
+        for band_idx, band in enumerate(bands):
+            for other in self._buckets[band_idx].get(band, []):
+                if other not in candidates:
+                    candidates.append(other)
+
+        best, best_similarity = None, self.threshold
+        for other in candidates:
+            similarity = self.similarity(sig, self._signatures[other])
+            if similarity >= best_similarity:
+                best, best_similarity = other, similarity
+        if best is not None:
+            return best
+
+        self._signatures[key] = sig
+        for band_idx, band in enumerate(bands):
+            self._buckets[band_idx][band].append(key)
+        return None
+
+
+class ArticleDeduplicator:
+    """
+    Two-pass near-duplicate detection that every article enters once: the original
+    text catches wire copies, the English text the same story in another language.
+    `duplicates` maps every duplicate to its root canonical article, so one instance
+    can be fed batch by batch (streaming) without re-indexing earlier articles.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.raw_index = NearDuplicateIndex(threshold=threshold)
+        self.en_index = NearDuplicateIndex(threshold=threshold)
+        self.duplicates: Dict[str, str] = {}
+        self.texts_en: Dict[str, str] = {}
+        self._copies: Dict[str, List[str]] = defaultdict(list)
+
+    def _mark(self, duplicate_id: str, canonical_id: str) -> None:
+        root = self.duplicates.get(canonical_id, canonical_id)
+        self.duplicates[duplicate_id] = root
+        self._copies[root].append(duplicate_id)
+        # Copies of an article that just turned out to be a duplicate move to its root
+        for copy_id in self._copies.pop(duplicate_id, []):
+            self.duplicates[copy_id] = root
+            self._copies[root].append(copy_id)
+
+    def add_raw(self, article_id: str, text: str) -> Optional[str]:
+        """First pass on the original text; returns the canonical key of a wire copy."""
+        canonical = self.raw_index.add(article_id, text)
+        if canonical is not None:
+            self._mark(article_id, canonical)
+        return canonical
+
+    def add_english(self, article_id: str, text_en: str) -> Optional[str]:
+        """Second pass on the English text of an article that is not a wire copy."""
+        self.texts_en[article_id] = text_en
+        canonical = self.en_index.add(article_id, text_en)
+        if canonical is not None:
+            self._mark(article_id, canonical)
+        return canonical
+
+
+def find_duplicates(items: List[Tuple[str, str]], threshold: float = DEFAULT_THRESHOLD) -> Dict[str, str]:
+    """Maps the key of every near-duplicate in items [(key, text)] to its canonical (first seen) key."""
+    index = NearDuplicateIndex(threshold=threshold)
+    duplicates: Dict[str, str] = {}
+    for key, text in items:
+        canonical = index.add(key, text)
+        if canonical is not None:
+            duplicates[key] = canonical
+    return duplicates
+
+
+def resolve_duplicates(duplicates: Dict[str, str]) -> Dict[str, str]:
+    """
+    Maps every duplicate to the root of its chain: the raw and the English pass can
+    give {en-0001: en-0000, en-0000: de-0000}, which becomes en-0001, en-0000 -> de-0000.
+    """
+    resolved = {}
+    for duplicate_id, canonical_id in duplicates.items():
+        seen = {duplicate_id}
+        while canonical_id in duplicates and canonical_id not in seen:
+            seen.add(canonical_id)
+            canonical_id = duplicates[canonical_id]
+        resolved[duplicate_id] = canonical_id
+    return resolved
+
+
+def copy_duplicate_results(
+    new_results: ResultsStore,
+    existing_results: ResultsStore,
+    model: str,
+    duplicates: Dict[str, str],
+    source_languages: Dict[str, str]
+) -> None:
+    """
+    Adds rows for duplicate articles to new_results by copying the scores of their
+    canonical article (from new_results or existing_results), following chains of
+    duplicates to their root. Copies carry duplicate_of.
+    """
+    article_ids, languages, scores, canonical_ids = [], [], [], []
+    labels = None
+    for duplicate_id, canonical_id in resolve_duplicates(duplicates).items():
+        if duplicate_id not in source_languages:
+            continue
+        if new_results.contains(model, duplicate_id) or existing_results.contains(model, duplicate_id):
+            continue
+        score = new_results.scores(model, canonical_id) or existing_results.scores(model, canonical_id)
+        if score is None:
+            continue
+        labels = list(score)
+        article_ids.append(duplicate_id)
+        languages.append(source_languages[duplicate_id])
+        scores.append(list(score.values()))
+        canonical_ids.append(canonical_id)
+
+    if article_ids:
+        new_results.add(model, labels, article_ids, languages, scores, canonical_ids)
@@ -0,0 +1,76 @@
+import re
+from typing import Optional
+
+from lxml import etree, html as lxml_html
+
+from graph.tracing import span
+
+# Pages larger than this are truncated before download finishes / before parsing.
+MAX_DOWNLOAD_BYTES = 2 * 1024 * 1024
+MAX_PARSE_CHARS = 1024 * 1024
+
+# Elements whose content is never part of the article body.
+BOILERPLATE_TAGS = ["script", "style", "noscript", "header", "footer", "aside", "form", "nav"]
+
+MIN_PARAGRAPH_LENGTH = 50
+
+_P_TAG = re.compile(r"<p[\s>]", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_\-]+)""", re.IGNORECASE)
+
+
+def decode_body(raw: bytes, declared_charset: Optional[str] = None) -> str:
+    """Decodes a page using the HTTP charset, then the <meta> charset, then UTF-8."""
+    candidates = [declared_charset]
+    match = _META_CHARSET.search(raw[:4096])
+    if match:
+        candidates.append(match.group(1).decode("ascii"))
+    candidates.append("utf-8")
+
+    for charset in candidates:
+        if not charset:
+            continue
+        try:
+            return raw.decode(charset, errors="replace")
+        except LookupError:
+            continue
+    return raw.decode("utf-8", errors="replace")
+
+
+_OUTSIDE_BOILERPLATE = " and ".join(f"not(ancestor::{tag})" for tag in BOILERPLATE_TAGS)
+_PARAGRAPHS = etree.XPath(f"//p[{_OUTSIDE_BOILERPLATE}]")
+_PARAGRAPH_STRINGS = etree.XPath(f".//text()[{_OUTSIDE_BOILERPLATE}]")
+
+
+def _paragraph_text(p) -> str:
+    # Same result as BeautifulSoup's p.get_text(" ", strip=True): text nodes only
+    # (no comments), each stripped, joined with single spaces
+    return " ".join(piece.strip() for piece in _PARAGRAPH_STRINGS(p) if piece.strip())
+
+
+def extract_article_text(html_text: Optional[str], max_chars: int = MAX_PARSE_CHARS) -> str:
+    """
+    Returns the article body: all <p> paragraphs longer than MIN_PARAGRAPH_LENGTH
+    characters, outside of boilerplate elements, joined with newlines.
+    Uses a single lxml parse; input beyond max_chars is ignored.
+    """
+    if not html_text:
+        return ""
+    if len(html_text) > max_chars:
+        html_text = html_text[:max_chars]
+    if not _P_TAG.search(html_text):
+        return ""
+
+    with span("html_parse", "extraction", chars=len(html_text)):
+        try:
+            root = lxml_html.document_fromstring(html_text)
+        except ValueError:
+            # str input with an XML encoding declaration must be parsed as bytes
+            try:
+                root = lxml_html.document_fromstring(html_text.encode("utf-8"))
+            except (etree.ParserError, ValueError):
+                return ""
+        except etree.ParserError:
+            return ""
+
+        paragraphs = (_paragraph_text(p) for p in _PARAGRAPHS(root))
+        return "\n".join(p for p in paragraphs if len(p) > MIN_PARAGRAPH_LENGTH)
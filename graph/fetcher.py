@@ -0,0 +1,201 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from graph.extraction import MAX_DOWNLOAD_BYTES, decode_body
+from graph.http_cache import HttpCache, get_http_cache
+from graph.tracing import span
+
+if TYPE_CHECKING:
+    import aiohttp
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
+]
+
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_PER_HOST_INTERVAL = 1.0
+READ_CHUNK_BYTES = 64 * 1024
+
+_defaults = {"max_connections": DEFAULT_MAX_CONNECTIONS, "per_host_interval": DEFAULT_PER_HOST_INTERVAL}
+
+
+def configure_fetcher(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    per_host_interval: float = DEFAULT_PER_HOST_INTERVAL
+) -> None:
+    """Defaults for fetchers created without explicit limits (e.g. by scrape nodes in build_graph)."""
+    _defaults["max_connections"] = max_connections
+    _defaults["per_host_interval"] = per_host_interval
+
+
+async def read_capped(resp: "aiohttp.ClientResponse", limit: int = MAX_DOWNLOAD_BYTES) -> bytes:
+    """
+    Reads the body until EOF or until `limit` bytes. StreamReader.read(n) alone
+    returns only what is already buffered, i.e. the first network chunk.
+    """
+    chunks, size = [], 0
+    async for chunk in resp.content.iter_chunked(READ_CHUNK_BYTES):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return b"".join(chunks)[:limit]
+
+
+def _close_pool(pool: Dict) -> None:
+    """Closes the session of a fetcher and stops its event loop thread."""
+    with pool["lock"]:
+        loop, thread, session = pool["loop"], pool["thread"], pool["session"]
+        if loop is None:
+            return
+        if session is not None:
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        pool.update(loop=None, thread=None, session=None)
+
+
+class AsyncFetcher:
+    """
+    Fetches pages concurrently with a bounded connection pool. Requests to the
+    same host are spaced by at least per_host_interval seconds, so politeness is
+    enforced per site instead of with a global sleep after every article. One
+    fetcher can be shared by scrape nodes running in different threads: every
+    collect() runs on the fetcher's own event loop thread with one session, so
+    max_connections caps the connections of all callers together.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        per_host_interval: Optional[float] = None,
+        timeout: float = 10.0
+    ):
+        self.max_connections = max_connections if max_connections is not None else _defaults["max_connections"]
+        self.per_host_interval = per_host_interval if per_host_interval is not None else _defaults["per_host_interval"]
+        self.timeout = timeout
+        self._host_last_request: Dict[str, float] = {}
+        # Event loop thread and session, started by the first collect()
+        self._pool = {"lock": threading.Lock(), "loop": None, "thread": None, "session": None}
+        self._finalizer = weakref.finalize(self, _close_pool, self._pool)
+
+    def close(self) -> None:
+        """Closes the connection pool; a later collect() opens a new one."""
+        _close_pool(self._pool)
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._pool["lock"]:
+            if self._pool["loop"] is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="fetcher-loop", daemon=True)
+                thread.start()
+                self._pool.update(loop=loop, thread=thread)
+            return self._pool["loop"]
+
+    async def _session(self) -> "aiohttp.ClientSession":
+        import aiohttp
+
+        # Only called on the fetcher's loop thread, so no lock is needed
+        if self._pool["session"] is None:
+            self._pool["session"] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._pool["session"]
+
+    async def _wait_for_host(self, host: str) -> None:
+        # Every collect() runs on the fetcher's loop, so claiming a slot needs no lock
+        while True:
+            elapsed = time.monotonic() - self._host_last_request.get(host, float("-inf"))
+            if elapsed >= self.per_host_interval:
+                self._host_last_request[host] = time.monotonic()
+                return
+            await asyncio.sleep(self.per_host_interval - elapsed)
+
+    async def fetch(self, session: "aiohttp.ClientSession", url: str) -> Optional[str]:
+        """
+        Returns the decoded body of url, or None on any error or non-2xx status.
+        Goes through the HTTP cache when it is enabled.
+        """
+        cache = get_http_cache()
+        entry = cache.load(url) if cache else None
+        if cache and entry and (cache.offline or cache.is_fresh(entry)):
+            cache.record("hits")
+            return entry["body"]
+        if cache and cache.offline:
+            cache.record("misses")
+            return None
+
+        await self._wait_for_host(urlparse(url).netloc)
+        headers = {"User-Agent": random.choice(USER_AGENTS), **HttpCache.conditional_headers(entry)}
+        try:
+            async with session.get(url, headers=headers) as resp:
+                if cache and entry and resp.status == 304:
+                    cache.record("revalidated")
+                    cache.touch(url, entry)
+                    return entry["body"]
+                if resp.status >= 400:
+                    return None
+                raw = await read_capped(resp)
+                body = decode_body(raw, resp.charset)
+                if cache:
+                    cache.record("misses")
+                    cache.store(url, body, dict(resp.headers))
+                return body
+        except Exception:
+            return None
+
+    async def _collect(
+        self,
+        urls: Sequence[str],
+        extract: Callable[[str], Optional[str]],
+        needed: int
+    ) -> List[Tuple[str, str]]:
+        session = await self._session()
+        loop = asyncio.get_running_loop()
+        collected: List[Tuple[str, str]] = []
+
+        async def fetch_and_extract(url: str) -> Tuple[str, Optional[str]]:
+            with span("http_fetch", "http", concurrent=True, host=urlparse(url).netloc) as fetch_span:
+                body = await self.fetch(session, url)
+                fetch_span.set(bytes=len(body) if body else 0, ok=body is not None)
+            # HTML parsing runs off the loop, which serves the fetches of every caller
+            return url, (await loop.run_in_executor(None, extract, body) if body else None)
+
+        tasks = [asyncio.create_task(fetch_and_extract(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                url, text = await next_done
+                if text:
+                    collected.append((url, text))
+                    if len(collected) >= needed:
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return collected
+
+    def collect(
+        self,
+        urls: Sequence[str],
+        extract: Callable[[str], Optional[str]],
+        needed: int
+    ) -> List[Tuple[str, str]]:
+        """
+        Fetches urls concurrently and applies extract to each body. Stops as soon as
+        `needed` bodies were accepted (extract returned a non-empty text) and returns
+        them as (url, text) pairs in completion order.
+        """
+        if needed <= 0 or not urls:
+            return []
+        return asyncio.run_coroutine_threadsafe(self._collect(urls, extract, needed), self._event_loop()).result()
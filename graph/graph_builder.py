@@ -1,9 +1,13 @@
+import functools
+import os
+import threading
+from typing import Callable, Optional
 from graph.nodes.scrape_node import scrape_node_factory
 from graph.nodes.save_final_state_node import save_final_state_node
 from graph.nodes.translate_to_multiple_node import translate_to_multiple_node
 from graph.nodes.translate_to_en_node import translate_to_en_node
 from graph.state_definitions import GraphState
-from langgraph.graph import StateGraph, END
+from graph.tracing import traced_node
 
 # --- Encoder models ---
 from graph.nodes.sentiment.sentiment_cardiff_node import sentiment_cardiff_node
@@ -15,68 +19,138 @@ from graph.nodes.sentiment.subjectivity_node import subjectivity_node
 from graph.nodes.sentiment.propaganda_detection_node import propaganda_detection_node
 
 from graph.nodes.display_results_node import display_results_node
+from graph.model_registry import registry
+
+ANALYZER_NODES = [
+    ("sentiment_cardiff", sentiment_cardiff_node),
+    ("toxic_bert", toxic_bert_node),
+    ("emotion_analysis", emotion_node),
+    ("irony_analysis", irony_node),
+    ("formality_analysis", formality_node),
+    ("subjectivity_mdeberta", subjectivity_node),
+    ("propaganda_detection", propaganda_detection_node),
+]
+
+# Rough peak memory of one encoder analyzer (weights + activations) in MB.
+ANALYZER_MEMORY_MB = 1024
+
+
+def _available_memory_mb() -> Optional[int]:
+    """
+    MemAvailable from /proc/meminfo: free memory plus reclaimable page cache.
+    SC_AVPHYS_PAGES (free pages only) is the fallback where /proc is missing.
+    """
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def analyzer_concurrency(num_analyzers: int) -> int:
+    """
+    Number of analyzers allowed to run at once: bounded by CPU cores and by the
+    registry memory budget (or free system memory when no budget is set).
+    """
+    limit = min(num_analyzers, os.cpu_count() or 1)
+
+    memory_mb = registry.max_memory_mb or _available_memory_mb()
+    if memory_mb is not None:
+        limit = min(limit, memory_mb // ANALYZER_MEMORY_MB)
+
+    return max(1, limit)
+
+
+_thread_budget_lock = threading.Lock()
+_thread_budget = {"active": 0, "base": None}
+
+
+class AnalyzerSlots:
+    """
+    Admits at most `limit` analyzers at once and splits torch's intra-op threads
+    between them (base threads // limit each), so concurrent models do not
+    oversubscribe the CPU. The thread count is per thread in torch, so every
+    analyzer sets its share on entry and restores the base count on exit.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._semaphore = threading.BoundedSemaphore(self.limit)
+
+    def __enter__(self) -> "AnalyzerSlots":
+        import torch
+
+        self._semaphore.acquire()
+        with _thread_budget_lock:
+            if _thread_budget["active"] == 0:
+                _thread_budget["base"] = torch.get_num_threads()
+            _thread_budget["active"] += 1
+            threads = max(1, _thread_budget["base"] // self.limit)
+        torch.set_num_threads(threads)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        import torch
+
+        with _thread_budget_lock:
+            _thread_budget["active"] -= 1
+            base = _thread_budget["base"]
+        torch.set_num_threads(base)
+        self._semaphore.release()
+
+
+def _with_limiter(node_fn: Callable, limiter: AnalyzerSlots) -> Callable:
+    @functools.wraps(node_fn)
+    def node(state: GraphState) -> GraphState:
+        with limiter:
+            return node_fn(state)
+    return node
+
+
+def build_graph(initial_state: GraphState, checkpointer=None):
+    from langgraph.graph import StateGraph, END
 
-
-def build_graph(initial_state: GraphState):
     workflow = StateGraph(GraphState)
 
     # --- Entry node ---
-    workflow.add_node("translate_to_many", translate_to_multiple_node)
+    workflow.add_node("translate_to_many", traced_node("translate_to_many", translate_to_multiple_node))
 
     # --- Scraping nodes ---
     scrape_nodes = []
     for lang in initial_state["selected_languages"]:
         node_name = f"scrape_{lang}"
-        workflow.add_node(node_name, scrape_node_factory(lang))
+        workflow.add_node(node_name, traced_node(node_name, scrape_node_factory(lang)))
         workflow.add_edge("translate_to_many", node_name)
         scrape_nodes.append(node_name)
 
     # --- Translate articles to english ---
-    workflow.add_node("translate_articles", translate_to_en_node)
+    workflow.add_node("translate_articles", traced_node("translate_articles", translate_to_en_node))
     for node_name in scrape_nodes:
         workflow.add_edge(node_name, "translate_articles")
 
-    # --- Analyze sentiment ---
-    previous_node = "translate_articles"
-
-    workflow.add_node("sentiment_cardiff", sentiment_cardiff_node)
-    workflow.add_edge(previous_node, "sentiment_cardiff")
-    previous_node = "sentiment_cardiff"
-
-    workflow.add_node("toxic_bert", toxic_bert_node)
-    workflow.add_edge(previous_node, "toxic_bert")
-    previous_node = "toxic_bert"
-
-    workflow.add_node("emotion_analysis", emotion_node)
-    workflow.add_edge(previous_node, "emotion_analysis")
-    previous_node = "emotion_analysis"
-
-    workflow.add_node("irony_analysis", irony_node)
-    workflow.add_edge(previous_node, "irony_analysis")
-    previous_node = "irony_analysis"
-
-    workflow.add_node("formality_analysis", formality_node)
-    workflow.add_edge(previous_node, "formality_analysis")
-    previous_node = "formality_analysis"
-
-    workflow.add_node("subjectivity_mdeberta", subjectivity_node)
-    workflow.add_edge(previous_node, "subjectivity_mdeberta")
-    previous_node = "subjectivity_mdeberta"
-
-    workflow.add_node("propaganda_detection", propaganda_detection_node)
-    workflow.add_edge(previous_node, "propaganda_detection")
-    previous_node = "propaganda_detection"
+    # --- Analyze sentiment (parallel fan-out, joined before saving) ---
+    limiter = AnalyzerSlots(analyzer_concurrency(len(ANALYZER_NODES)))
+    for node_name, node_fn in ANALYZER_NODES:
+        # Traced inside the limiter, so waiting for a slot is not counted as node time
+        workflow.add_node(node_name, _with_limiter(traced_node(node_name, node_fn), limiter))
+        workflow.add_edge("translate_articles", node_name)
 
     # --- Save state ---
-    workflow.add_node("save_final_state_node", save_final_state_node)
-    workflow.add_edge(previous_node, "save_final_state_node")
+    workflow.add_node("save_final_state_node", traced_node("save_final_state_node", save_final_state_node))
+    workflow.add_edge([node_name for node_name, _ in ANALYZER_NODES], "save_final_state_node")
 
     # --- Display results in the table ---
-    workflow.add_node("display_results", display_results_node)
+    workflow.add_node("display_results", traced_node("display_results", display_results_node))
     workflow.add_edge("save_final_state_node", "display_results")
 
     # --- End ---
     workflow.add_edge("display_results", END)
     workflow.set_entry_point("translate_to_many")
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
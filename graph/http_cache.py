@@ -0,0 +1,153 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from graph.tracing import span
+
+DEFAULT_CACHE_DIR = "cache/http"
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+# Bumped when stored bodies may be wrong; older entries are fetched again.
+# 2: bodies of AsyncFetcher are read to EOF (1 kept only the first network chunk)
+CACHE_FORMAT = 2
+
+
+class HttpCache:
+    """
+    On-disk cache of HTTP response bodies keyed by URL. Every entry is stored as a
+    gzip-compressed JSON file together with its ETag / Last-Modified validators.
+    Entries younger than ttl_seconds are served directly; older ones are revalidated
+    with a conditional request. In offline mode the network is never used.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl_seconds: float = DEFAULT_TTL_SECONDS, offline: bool = False):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.offline = offline
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def load(self, url: str) -> Optional[Dict]:
+        try:
+            with gzip.open(self._path(url), "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url or entry.get("format") != CACHE_FORMAT:
+            return None
+        return entry
+
+    def store(self, url: str, body: str, headers: Dict[str, str]) -> None:
+        headers = {name.lower(): value for name, value in headers.items()}
+        entry = {
+            "format": CACHE_FORMAT,
+            "url": url,
+            "body": body,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": time.time()
+        }
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def touch(self, url: str, entry: Dict) -> None:
+        """Marks a revalidated (304 Not Modified) entry as fresh again."""
+        self.store(url, entry["body"], {"etag": entry.get("etag"), "last-modified": entry.get("last_modified")})
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry.get("fetched_at", 0) < self.ttl_seconds
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+_cache_settings = {"enabled": True, "directory": DEFAULT_CACHE_DIR, "ttl_seconds": DEFAULT_TTL_SECONDS, "offline": False}
+
+
+def configure_http_cache(
+    enabled: bool = True,
+    directory: str = DEFAULT_CACHE_DIR,
+    ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    offline: bool = False
+) -> None:
+    global _cache
+    with _cache_lock:
+        _cache = None
+        _cache_settings.update(enabled=enabled or offline, directory=directory, ttl_seconds=ttl_seconds, offline=offline)
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Returns the process-wide HTTP cache, or None when caching is disabled."""
+    global _cache
+    with _cache_lock:
+        if not _cache_settings["enabled"]:
+            return None
+        if _cache is None:
+            _cache = HttpCache(_cache_settings["directory"], _cache_settings["ttl_seconds"], _cache_settings["offline"])
+        return _cache
+
+
+def cached_get(session, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None, timeout: float = 10) -> Optional[str]:
+    """
+    GET through the HTTP cache with a requests session (or the requests module).
+    Returns the body text, or None when offline and the page is not cached.
+    HTTP errors are raised by resp.raise_for_status(), so callers keep their own
+    error handling.
+    """
+    import requests
+
+    full_url = requests.Request("GET", url, params=params).prepare().url
+    cache = get_http_cache()
+    entry = cache.load(full_url) if cache else None
+
+    if cache and entry and (cache.offline or cache.is_fresh(entry)):
+        cache.record("hits")
+        return entry["body"]
+    if cache and cache.offline:
+        cache.record("misses")
+        return None
+
+    request_headers = {**(headers or {}), **HttpCache.conditional_headers(entry)}
+    with span("http_get", "http", host=urlparse(full_url).netloc) as get_span:
+        resp = session.get(full_url, headers=request_headers, timeout=timeout)
+        get_span.set(status=resp.status_code, bytes=len(resp.content))
+    if cache and entry and resp.status_code == 304:
+        cache.record("revalidated")
+        cache.touch(full_url, entry)
+        return entry["body"]
+
+    resp.raise_for_status()
+    if cache:
+        cache.record("misses")
+        cache.store(full_url, resp.text, dict(resp.headers))
+    return resp.text
@@ -0,0 +1,205 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple
+
+from graph.onnx_backend import load_onnx_model, onnx_enabled
+from graph.quantization import load_quantized_model, quantization_enabled, quantization_key
+from graph.tracing import span
+
+if TYPE_CHECKING:
+    import torch
+
+
+def _default_device() -> str:
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def _empty_cuda_cache() -> None:
+    import torch
+
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def is_stale(artifact_path: str, model_path: str) -> bool:
+    """
+    True when a file derived from a model (ONNX export, CTranslate2 conversion) is
+    missing or older than any file of the local model directory. Hub models are
+    never considered stale once the artifact exists.
+    """
+    if not os.path.exists(artifact_path):
+        return True
+    if not os.path.isdir(model_path):
+        return False
+    built = os.path.getmtime(artifact_path)
+    return any(
+        os.path.getmtime(os.path.join(model_path, name)) > built
+        for name in os.listdir(model_path)
+        if os.path.isfile(os.path.join(model_path, name))
+    )
+
+
+def _model_size_bytes(model: Any) -> int:
+    """Approximate in-memory size of a torch model (parameters + buffers)."""
+    try:
+        params = sum(p.numel() * p.element_size() for p in model.parameters())
+        buffers = sum(b.numel() * b.element_size() for b in model.buffers())
+        return params + buffers
+    except Exception:
+        return 0
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of (tokenizer, model) pairs keyed by (path, device, dtype).
+    Models are loaded once and reused by every node call. When the total size of
+    cached models exceeds max_memory_mb, the least recently used ones are evicted.
+    """
+
+    def __init__(self, max_memory_mb: Optional[int] = None):
+        self.max_memory_mb = max_memory_mb
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[Any, Any, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._key_locks: dict[Tuple[str, str, str], threading.Lock] = {}
+
+    def configure(self, max_memory_mb: Optional[int] = None) -> None:
+        with self._lock:
+            self.max_memory_mb = max_memory_mb
+            self._evict()
+
+    def get(
+        self,
+        model_path: str,
+        model_cls: Any,
+        tokenizer_cls: Any,
+        device: Optional[str] = None,
+        dtype: Optional["torch.dtype"] = None,
+        quantize: bool = False,
+        onnx: bool = False,
+        **model_kwargs
+    ) -> Tuple[Any, Any, str]:
+        """
+        Returns (tokenizer, model, device) for model_path, loading it on first use.
+        On CPU, and only for callers that opt in:
+        - quantize: use the int8 model when quantized mode is enabled
+        - onnx: run the model on ONNX Runtime when the onnx backend is selected
+        Extra keyword arguments are forwarded to model_cls.from_pretrained.
+        """
+        device = device or _default_device()
+        use_onnx = onnx and onnx_enabled() and device == "cpu" and dtype is None
+        if use_onnx:
+            quantized = "qint8" if quantize and quantization_enabled() else None
+            backend_key = "onnx-int8" if quantized else "onnx"
+        else:
+            quantized = quantization_key(quantize, device, dtype)
+            backend_key = quantized or str(dtype)
+        key = (model_path, device, backend_key)
+
+        def load() -> Tuple[Any, Any, int]:
+            tokenizer = tokenizer_cls.from_pretrained(model_path)
+            if use_onnx:
+                model, size = load_onnx_model(model_path, model_cls, tokenizer, quantized=bool(quantized), **model_kwargs)
+            elif quantized:
+                model, size = load_quantized_model(model_path, model_cls, **model_kwargs)
+            else:
+                kwargs = {**model_kwargs, "torch_dtype": dtype} if dtype is not None else model_kwargs
+                model = model_cls.from_pretrained(model_path, **kwargs).to(device)
+                model.eval()
+                size = _model_size_bytes(model)
+            return tokenizer, model, size
+
+        tokenizer, model = self.get_or_load(
+            key, load, quantized=bool(quantized), backend="onnx" if use_onnx else "torch"
+        )
+        return tokenizer, model, device
+
+    def get_or_load(self, key: Tuple[str, str, str], load: Callable[[], Tuple[Any, Any, int]], **span_args) -> Tuple[Any, Any]:
+        """
+        Returns the cached (tokenizer, model) for key = (model_path, device, variant), or
+        calls load() -> (tokenizer, model, size in bytes) and caches the result.
+        Used by get and by loaders of models that are not transformers classes.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                tokenizer, model, _ = self._entries[key]
+                return tokenizer, model
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so different models can load concurrently,
+        # but never load the same model twice.
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    tokenizer, model, _ = self._entries[key]
+                    return tokenizer, model
+
+            model_path, device, _ = key
+            print(f"   📦 Loading model '{model_path}' on {device}")
+            with span("model_load", "model", model=model_path, device=device) as load_span:
+                tokenizer, model, size = load()
+                load_span.set(bytes=size, **span_args)
+
+            with self._lock:
+                self._entries[key] = (tokenizer, model, size)
+                self._evict(keep=key)
+
+        return tokenizer, model
+
+    def loaded_models(self) -> list:
+        """Keys (model_path, device, variant) of the cached models, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(size for _, _, size in self._entries.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            had_entries = bool(self._entries)
+            self._entries.clear()
+        if had_entries:
+            _empty_cuda_cache()
+
+    def _evict(self, keep: Optional[Tuple[str, str, str]] = None) -> None:
+        if self.max_memory_mb is None:
+            return
+        budget = self.max_memory_mb * 1024 * 1024
+        evicted = False
+        while self._entries and self.total_bytes() > budget:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._entries.pop(oldest)
+            print(f"   ♻️ Evicted model '{oldest[0]}' from registry (memory budget {self.max_memory_mb} MB)")
+            evicted = True
+        if evicted:
+            _empty_cuda_cache()
+
+
+registry = ModelRegistry()
+
+
+def get_model(
+    model_path: str,
+    model_cls: Any,
+    tokenizer_cls: Any,
+    device: Optional[str] = None,
+    dtype: Optional["torch.dtype"] = None,
+    quantize: bool = False,
+    onnx: bool = False,
+    **model_kwargs
+) -> Tuple[Any, Any, str]:
+    """Shortcut for registry.get on the process-wide registry."""
+    return registry.get(
+        model_path, model_cls, tokenizer_cls, device=device, dtype=dtype, quantize=quantize, onnx=onnx, **model_kwargs
+    )
+
+
+def configure_registry(max_memory_mb: Optional[int] = None) -> None:
+    registry.configure(max_memory_mb=max_memory_mb)
@@ -1,29 +1,13 @@
-from graph.state_definitions import GraphState, ModelResult
-from typing import Dict, Tuple
-from collections import defaultdict
+from graph.aggregation import ResultsAggregator
+from graph.results_store import as_results_store
+from graph.state_definitions import GraphState
+from typing import Dict, List, Optional, Tuple
 from tabulate import tabulate
 import os
 import html
 import re
 from datetime import datetime
 
-MODEL_SHORT_NAMES = {
-    "models/encoders/twitter-roberta-base-sentiment-latest": "sentiment",
-    "unitary/toxic-bert": "toxicity",
-    "j-hartmann/emotion-english-distilroberta-base": "emotion",
-    "cardiffnlp/twitter-roberta-base-irony": "irony",
-    "cointegrated/roberta-base-formality": "formality",
-    "GroNLP/mdebertav3-subjectivity-english": "objectivity",
-    "IDA-SERICS/PropagandaDetection": "propaganda"
-}
-
-FIXED_LABELS = {
-    "formality": "formal",
-    "irony": "irony",
-    "propaganda": "propaganda",
-    "objectivity": "objective"
-}
-
 HTML_COLORS = {
     "positive": "green",
     "neutral": "black",
@@ -38,16 +22,17 @@ HTML_COLORS = {
 
 def colorize_cell_cli(model: str, labels: list[Tuple[str, float]]) -> str:
     reset = "\033[0m"
+    default = "\033[97m"
     if model == "sentiment":
         colors = {"positive": "\033[92m", "neutral": "\033[97m", "negative": "\033[91m"}
-        return ", ".join(f"{colors.get(lbl,'\033[97m')}{lbl} ({val:.3f}){reset}" for lbl, val in labels)
+        return ", ".join(f"{colors.get(lbl, default)}{lbl} ({val:.3f}){reset}" for lbl, val in labels)
     
     elif model == "emotion":
         colors = {
             "anger":"\033[91m", "fear":"\033[91m", "disgust":"\033[91m",
             "sadness":"\033[91m", "neutral":"\033[97m", "joy":"\033[92m", "surprise":"\033[92m"
         }
-        return ", ".join(f"{colors.get(lbl,'\033[97m')}{lbl} ({val:.3f}){reset}" for lbl, val in labels)
+        return ", ".join(f"{colors.get(lbl, default)}{lbl} ({val:.3f}){reset}" for lbl, val in labels)
     
     else:
         label, value = labels[0] if labels else ("", 0.0)
@@ -81,69 +66,67 @@ def colorize_cell_html(model: str, labels: list[Tuple[str, float]]) -> str:
             color = "black"
         return f'<span style="color:{color}">{value:.3f}</span>'
 
-def display_results_node(state: GraphState) -> GraphState:
-    results: list[ModelResult] = state.get("results", [])
-    if not results:
-        print("❗ No results to display.")
-        return {}
+ALL_MODELS = ["emotion", "formality", "irony", "propaganda", "sentiment", "objectivity", "toxicity"]
 
-    # --- Results aggregation ---
-    aggregated: Dict[str, Dict[str, list[Tuple[str, float]]]] = defaultdict(lambda: defaultdict(list))
-    for r in results:
-        lang = r["source_language"]
-        model_short = MODEL_SHORT_NAMES.get(r["model"], r["model"])
-        score = r["score"]
-
-        if isinstance(score, dict):
-            if model_short in FIXED_LABELS:
-                val = float(score.get(FIXED_LABELS[model_short], 0.0))
-                aggregated[lang][model_short].append((FIXED_LABELS[model_short], val))
-            else:
-                for lbl, val in score.items():
-                    aggregated[lang][model_short].append((lbl, float(val)))
-        else:
-            aggregated[lang][model_short].append(("", float(score)))
-
-    # --- Calculate mean and sort ---
-    final_data = {}
-    for lang, model_data in aggregated.items():
-        final_data[lang] = {}
-        for model, vals in model_data.items():
-            if model in FIXED_LABELS:
-                avg_value = sum(v for _, v in vals) / len(vals)
-                final_data[lang][model] = [(FIXED_LABELS[model], avg_value)]
-            else:
-                label_avg = {lbl: sum(v for l,v in vals if l==lbl)/len([v for l,v in vals if l==lbl]) for lbl,_ in vals}
-                if model == "sentiment":
-                    sorted_labels = sorted(label_avg.items(), key=lambda x: x[1], reverse=True)
-                else:
-                    sorted_labels = sorted(label_avg.items(), key=lambda x: x[1], reverse=True)[:2]
-                final_data[lang][model] = sorted_labels
-
-    all_models = ["emotion", "formality", "irony", "propaganda", "sentiment", "objectivity", "toxicity"]
 
-    # --- Display in CLI ---
+def render_cli_table(final_data: Dict[str, Dict[str, List[Tuple[str, float]]]]) -> str:
     table_rows_cli = []
     for lang, model_scores in final_data.items():
         row = [lang]
-        for model in all_models:
+        for model in ALL_MODELS:
             if model in model_scores:
                 row.append(colorize_cell_cli(model, model_scores[model]))
             else:
                 row.append("-")
         table_rows_cli.append(row)
+    return tabulate(table_rows_cli, headers=["Language"] + ALL_MODELS, tablefmt="fancy_grid")
+
+
+def cell_tooltip(aggregator: ResultsAggregator, lang: str, model: str, labels: List[Tuple[str, float]]) -> str:
+    parts = []
+    for lbl, _ in labels:
+        stats = aggregator.stats(lang, model, lbl)
+        if stats is not None:
+            parts.append(
+                f"{lbl}: n={stats.count}, sd={stats.variance ** 0.5:.3f}, "
+                f"p10={stats.quantile(0.1):.2f}, median={stats.quantile(0.5):.2f}, p90={stats.quantile(0.9):.2f}"
+            )
+    return html.escape("; ".join(parts), quote=True)
 
-    headers = ["Language", "emotion", "formality", "irony", "propaganda", "sentiment", "objectivity", "toxicity"]
+
+def results_html_path(prompt: str, directory: str = "output") -> str:
+    """Path of the HTML view written for a topic."""
+    safe_prompt = re.sub(r'[\\/:"*?<>|]+', "_", prompt)
+    safe_prompt = safe_prompt.replace(" ", "-")
+    return os.path.join(directory, f"clsa_results_{safe_prompt}.html")
+
+
+def display_results_node(state: GraphState, aggregator: Optional[ResultsAggregator] = None) -> GraphState:
+    """
+    Prints the per-language table and writes the HTML view (into state["html_dir"] if
+    set, else output/). A streaming run passes the aggregator it has been updating live;
+    otherwise one is built from state["results"].
+    """
+    if aggregator is None:
+        aggregator = ResultsAggregator(count_duplicates=state.get("count_duplicates", True))
+        aggregator.add_store(as_results_store(state.get("results")))
+    final_data = aggregator.table()
+    if not final_data:
+        print("❗ No results to display.")
+        return {}
+
+    # --- Display in CLI ---
     print("\n📊 ADVANCED COLOR-CODED RESULTS TABLE (CLI view):\n")
-    print(tabulate(table_rows_cli, headers=headers, tablefmt="fancy_grid"))
+    print(render_cli_table(final_data))
 
     # --- Create HTML ---
     html_rows = []
     for lang, model_scores in final_data.items():
         row_html = f"<tr><td>{html.escape(lang)}</td>"
-        for model in all_models:
+        for model in ALL_MODELS:
             if model in model_scores:
-                row_html += f"<td>{colorize_cell_html(model, model_scores[model])}</td>"
+                tooltip = cell_tooltip(aggregator, lang, model, model_scores[model])
+                row_html += f'<td title="{tooltip}">{colorize_cell_html(model, model_scores[model])}</td>'
             else:
                 row_html += "<td>-</td>"
         row_html += "</tr>"
@@ -178,11 +161,9 @@ def display_results_node(state: GraphState) -> GraphState:
     </html>
     """
 
-    os.makedirs("output", exist_ok=True)
-    output_file = "output/results.html"
-    safe_prompt = re.sub(r'[\\/:"*?<>|]+', "_", prompt)
-    safe_prompt = safe_prompt.replace(" ", "-")
-    output_file = f"output/clsa_results_{safe_prompt}.html"
+    html_dir = state.get("html_dir") or "output"
+    os.makedirs(html_dir, exist_ok=True)
+    output_file = results_html_path(prompt, html_dir)
 
     with open(output_file, "w", encoding="utf-8") as f:
         f.write(html_table)
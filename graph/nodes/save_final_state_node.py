@@ -1,20 +1,16 @@
-import json
-import os
+from graph.run_output import save_run
 from graph.state_definitions import GraphState
 
 def save_final_state_node(state: GraphState) -> GraphState:
     """
-    Saves the final workflow state as a JSON file in the project directory.
+    Streams the final workflow state to a run-scoped directory (see graph.run_output.save_run).
     """
-    output_dir = "output"
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, "final_state.json")
-
+    run_id = state.get("run_id") or "unnamed-run"
     try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
-        print(f"\n✅ NODE: save_final_state_node — state saved to '{output_file}'\n")
+        output_dir = save_run(state, run_id)
+        print(f"\n✅ NODE: save_final_state_node — state saved to '{output_dir}'\n")
     except Exception as e:
-        print(f"⚠️ Could not save state to JSON: {e}")
+        print(f"⚠️ Could not save state: {e}")
 
-    return state
+    # Returning the state would re-append every reducer list to itself
+    return {}
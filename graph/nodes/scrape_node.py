@@ -1,18 +1,53 @@
-import requests
-from bs4 import BeautifulSoup
 import time
 import random
+from typing import Callable, Optional
 from urllib.parse import urlparse, parse_qs, unquote
-from graph.state_definitions import GraphState, RawArticle
+from graph.extraction import extract_article_text
+from graph.fetcher import AsyncFetcher, USER_AGENTS
+from graph.http_cache import cached_get
+from graph.state_definitions import GraphState, RawArticle, make_article_id
+from graph.tracing import span
+
+DDG_SEARCH_URL = "https://duckduckgo.com/html/"
+BING_RSS_URL = "https://www.bing.com/news/search?q={query}&format=rss"
+
+_search_endpoints = {"ddg": DDG_SEARCH_URL, "bing_rss": BING_RSS_URL}
+
+
+def configure_search_endpoints(ddg_url: str = DDG_SEARCH_URL, bing_rss_url: str = BING_RSS_URL) -> None:
+    """
+    Points scrape nodes at other search endpoints, e.g. a local stand-in server for
+    benchmarks. Both URLs may contain a {language} placeholder; bing_rss_url needs {query}.
+    """
+    _search_endpoints["ddg"] = ddg_url
+    _search_endpoints["bing_rss"] = bing_rss_url
+
+def scrape_node_factory(
+    language: str,
+    min_length: int = 150,
+    fetcher: Optional[AsyncFetcher] = None,
+    on_article: Optional[Callable[[RawArticle], None]] = None
+):
+    fetcher = fetcher or AsyncFetcher()
+
+    def accept_ddg(html_text: str) -> Optional[str]:
+        text_body = extract_article_text(html_text)
+        if not text_body or len(text_body) < min_length:
+            return None
+        if language != "en" and any(x in text_body.lower() for x in ["cookies", "privacy", "accept", "terms", "javascript"]):
+            return None
+        return text_body
+
+    def accept_bing(html_text: str) -> Optional[str]:
+        text_body = extract_article_text(html_text)
+        if not text_body or len(text_body) < min_length:
+            return None
+        return text_body
 
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
-    "Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
-]
-
-def scrape_node_factory(language: str, min_length: int = 150):
     def scrape_node(state: GraphState) -> GraphState:
+        import requests
+        from bs4 import BeautifulSoup
+
         candidates = [it for it in state["input_text"] if it["language"] == language]
         if not candidates:
             print(f"[{language.upper()}] ❗ No input_text entry found — skipping.")
@@ -21,10 +56,9 @@ def scrape_node_factory(language: str, min_length: int = 150):
         query_text = candidates[0]["text"]
         num_articles = state.get("num_articles", 3)
         collected = []
-        start_article_id = len(state.get("raw_articles", []))
         visited_urls = set()
 
-        base_url = "https://duckduckgo.com/html/"
+        base_url = _search_endpoints["ddg"].format(language=language)
         params = {"q": f"{query_text} news", "kl": "wt-wt", "s": "0"}
 
         print(f"[{language.upper()}] 🔍 Searching DuckDuckGo news for: '{query_text[:50]}...'")
@@ -34,38 +68,50 @@ def scrape_node_factory(language: str, min_length: int = 150):
         def safe_get(url, params=None, retry_delay=5):
             headers = {"User-Agent": random.choice(USER_AGENTS), "Referer": "https://duckduckgo.com/"}
             try:
-                resp = session.get(url, params=params, headers=headers, timeout=10)
-                if resp.status_code == 403:
+                return cached_get(session, url, params=params, headers=headers, timeout=10)
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code == 403:
                     print(f"[{language.upper()}] 🚫 DDG 403 Forbidden — retrying after {retry_delay}s...")
                     time.sleep(retry_delay)
                     return None
-                resp.raise_for_status()
-                return resp
+                print(f"[{language.upper()}] ❗ Request failed: {e}")
+                return None
             except Exception as e:
                 print(f"[{language.upper()}] ❗ Request failed: {e}")
                 return None
 
+        def add_articles(fetched):
+            for _, text_body in fetched:
+                article_entry: RawArticle = {
+                    "article_id": make_article_id(language, len(collected)),
+                    "language": language,
+                    "text": text_body
+                }
+                collected.append(article_entry)
+                if on_article:
+                    on_article(article_entry)
+            print(f"[{language.upper()}] ✅ Articles collected: {len(collected)}/{num_articles}", end="\r")
+
         page = 0
         max_pages = 5
 
         # DuckDuckGo phase
         while len(collected) < num_articles and page < max_pages:
             params["s"] = str(page * 50)
-            resp = safe_get(base_url, params)
-            if not resp:
+            results_html = safe_get(base_url, params)
+            if not results_html:
                 break
 
-            soup = BeautifulSoup(resp.text, "html.parser")
-            links = [a.get("href") for a in soup.select("a.result__a, a.result__url") if a.get("href")]
+            with span("search_parse", "extraction", language=language, chars=len(results_html)):
+                soup = BeautifulSoup(results_html, "html.parser")
+                links = [a.get("href") for a in soup.select("a.result__a, a.result__url") if a.get("href")]
             if not links:
                 break
 
             print(f"[{language.upper()}] 🌐 Found {len(links)} potential results on page {page + 1}")
 
+            page_urls = []
             for link in links:
-                if len(collected) >= num_articles:
-                    break
-
                 parsed = urlparse(link)
                 qs = parse_qs(parsed.query)
                 actual_url = unquote(qs["uddg"][0]) if "uddg" in qs else link
@@ -73,37 +119,9 @@ def scrape_node_factory(language: str, min_length: int = 150):
                 if actual_url in visited_urls:
                     continue
                 visited_urls.add(actual_url)
+                page_urls.append(actual_url)
 
-                try:
-                    headers = {"User-Agent": random.choice(USER_AGENTS)}
-                    r = requests.get(actual_url, headers=headers, timeout=10)
-                    r.encoding = r.apparent_encoding
-                    r.raise_for_status()
-                    page_soup = BeautifulSoup(r.text, "html.parser")
-
-                    for tag in page_soup(["script", "style", "noscript", "header", "footer", "aside", "form", "nav"]):
-                        tag.decompose()
-
-                    paragraphs = [p.get_text(" ", strip=True) for p in page_soup.find_all("p")]
-                    text_body = "\n".join(p for p in paragraphs if len(p) > 50)
-
-                    if not text_body or len(text_body) < min_length:
-                        continue
-                    if language != "en" and any(x in text_body.lower() for x in ["cookies", "privacy", "accept", "terms", "javascript"]):
-                        continue
-
-                    article_entry: RawArticle = {
-                        "article_id": start_article_id + len(collected),
-                        "language": language,
-                        "text": text_body
-                    }
-                    collected.append(article_entry)
-                    print(f"[{language.upper()}] ✅ Articles collected: {len(collected)}/{num_articles}", end="\r")
-
-                except Exception:
-                    continue
-
-                time.sleep(random.uniform(1.0, 2.5))
+            add_articles(fetcher.collect(page_urls, accept_ddg, num_articles - len(collected)))
 
             page += 1
 
@@ -111,40 +129,22 @@ def scrape_node_factory(language: str, min_length: int = 150):
         if len(collected) < num_articles:
             missing = num_articles - len(collected)
             print(f"\n[{language.upper()}] ⚠️ Only {len(collected)} collected — using Bing News RSS to fetch {missing} more...")
-            bing_rss = f"https://www.bing.com/news/search?q={query_text}&format=rss"
+            bing_rss = _search_endpoints["bing_rss"].format(query=query_text, language=language)
 
             try:
-                resp = requests.get(bing_rss, headers={"User-Agent": random.choice(USER_AGENTS)}, timeout=10)
-                resp.raise_for_status()
-                soup = BeautifulSoup(resp.text, "xml")
+                rss_text = cached_get(requests, bing_rss, headers={"User-Agent": random.choice(USER_AGENTS)}, timeout=10)
+                soup = BeautifulSoup(rss_text or "", "xml")
                 items = soup.find_all("item")
 
+                rss_urls = []
                 for item in items:
-                    if len(collected) >= num_articles:
-                        break
                     link = item.link.text.strip()
                     if link in visited_urls:
                         continue
                     visited_urls.add(link)
+                    rss_urls.append(link)
 
-                    try:
-                        r = requests.get(link, headers={"User-Agent": random.choice(USER_AGENTS)}, timeout=10)
-                        r.encoding = r.apparent_encoding
-                        r.raise_for_status()
-                        ps = BeautifulSoup(r.text, "html.parser")
-                        for tag in ps(["script", "style", "noscript", "header", "footer", "aside", "form", "nav"]):
-                            tag.decompose()
-                        paragraphs = [p.get_text(" ", strip=True) for p in ps.find_all("p")]
-                        text_body = "\n".join(p for p in paragraphs if len(p) > 50)
-                        if not text_body or len(text_body) < min_length:
-                            continue
-                        collected.append({
-                            "article_id": start_article_id + len(collected),
-                            "language": language,
-                            "text": text_body
-                        })
-                    except Exception:
-                        continue
+                add_articles(fetcher.collect(rss_urls, accept_bing, missing))
 
             except Exception as e:
                 print(f"[{language.upper()}] ❗ Bing News RSS failed: {e}")
@@ -155,7 +155,7 @@ def scrape_node_factory(language: str, min_length: int = 150):
         else:
             print(f"\n[{language.upper()}] ⚠️ Finished but only {len(collected)}/{num_articles} collected ❌")
 
-        new_raw_articles = state.get("raw_articles", []) + collected
-        return {"raw_articles": new_raw_articles}
+        # raw_articles has an operator.add reducer: return only the new articles
+        return {"raw_articles": collected}
 
     return scrape_node
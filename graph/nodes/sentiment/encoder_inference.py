@@ -0,0 +1,233 @@
+import hashlib
+import threading
+import time
+import weakref
+from graph.state_definitions import TranslatedArticles
+from graph.tracing import span
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import torch
+
+DEFAULT_BATCH_SIZE = 16
+
+_batch_size = DEFAULT_BATCH_SIZE
+_batcher = None
+
+# Overflow-chunk encodings shared by all analyzers within a run, keyed by
+# (run_id, tokenizer fingerprint, max_length, stride, article_id) -> (text, chunks).
+_tokenization_cache: Dict[Tuple[Optional[str], str, int, int, str], Tuple[str, List[Tuple[List[int], List[int]]]]] = {}
+_tokenization_lock = threading.Lock()
+_fingerprints: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def configure_batch_size(batch_size: int) -> None:
+    """Sets the number of chunks sent through an encoder in one forward pass."""
+    global _batch_size
+    _batch_size = max(1, int(batch_size))
+
+
+class SharedForwardBatcher:
+    """
+    Merges the chunks of concurrent classify_articles calls on the same model into
+    shared forward passes. The first caller waits max_wait seconds for others to
+    join, runs all collected chunks and hands every caller its own scores.
+    """
+
+    def __init__(self, max_wait: float = 0.05):
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._open: Dict[Tuple[int, str], dict] = {}
+
+    def run(self, key: Tuple[int, str], chunks: list, forward) -> List["torch.Tensor"]:
+        with self._lock:
+            group = self._open.get(key)
+            leader = group is None
+            if leader:
+                group = self._open[key] = {"chunks": [], "done": threading.Event(), "scores": None, "error": None}
+            offset = len(group["chunks"])
+            group["chunks"].extend(chunks)
+
+        if leader:
+            time.sleep(self.max_wait)
+            with self._lock:
+                del self._open[key]
+            try:
+                group["scores"] = forward(group["chunks"])
+            except Exception as e:
+                group["error"] = e
+            group["done"].set()
+        else:
+            group["done"].wait()
+
+        if group["error"] is not None:
+            raise group["error"]
+        return group["scores"][offset:offset + len(chunks)]
+
+
+def configure_shared_batching(enabled: bool, max_wait: float = 0.05) -> None:
+    """
+    enabled: concurrent runs in one process (the service) share encoder forward
+    passes; chunks from different runs are batched together.
+    """
+    global _batcher
+    _batcher = SharedForwardBatcher(max_wait) if enabled else None
+
+
+def clear_tokenization_cache(run_id: Optional[str] = None) -> None:
+    """
+    Drops all cached chunk encodings, or with run_id only that run's; call at the
+    start of every run (or, in a long-lived process, when a run finishes).
+    """
+    with _tokenization_lock:
+        if run_id is None:
+            _tokenization_cache.clear()
+            return
+        for key in [key for key in _tokenization_cache if key[0] == run_id]:
+            del _tokenization_cache[key]
+
+
+def tokenizer_fingerprint(tokenizer) -> str:
+    """
+    Hash of the tokenizer class and vocabulary. Models that share a tokenizer
+    (e.g. the RoBERTa-family analyzers) get the same fingerprint.
+    """
+    try:
+        return _fingerprints[tokenizer]
+    except (KeyError, TypeError):
+        pass
+
+    digest = hashlib.sha1(type(tokenizer).__name__.encode("utf-8"))
+    for token, token_id in sorted(tokenizer.get_vocab().items(), key=lambda item: item[1]):
+        digest.update(f"{token_id}\t{token}\n".encode("utf-8"))
+    fingerprint = digest.hexdigest()
+
+    try:
+        _fingerprints[tokenizer] = fingerprint
+    except TypeError:
+        pass
+    return fingerprint
+
+
+def encode_article_chunks(tokenizer, text: str, max_length: int = 512, stride: int = 50) -> List[Tuple[List[int], List[int]]]:
+    """Splits text into overflow chunks of at most max_length tokens, without padding."""
+    encodings = tokenizer(
+        text,
+        truncation=True,
+        max_length=max_length,
+        stride=stride,
+        return_overflowing_tokens=True,
+        padding=False
+    )
+    return list(zip(encodings["input_ids"], encodings["attention_mask"]))
+
+
+def cached_article_chunks(
+    tokenizer,
+    article: TranslatedArticles,
+    max_length: int = 512,
+    stride: int = 50,
+    run_id: Optional[str] = None
+) -> List[Tuple[List[int], List[int]]]:
+    """
+    encode_article_chunks with results shared between analyzers using the same tokenizer.
+    Entries are scoped by run_id, since concurrent runs reuse article IDs like 'en-0000'.
+    """
+    text = article["text_en"]
+    key = (run_id, tokenizer_fingerprint(tokenizer), max_length, stride, article["article_id"])
+
+    with _tokenization_lock:
+        cached = _tokenization_cache.get(key)
+    if cached is not None and cached[0] == text:
+        return cached[1]
+
+    with span("tokenize", "encoder", articles=1) as tokenize_span:
+        chunks = encode_article_chunks(tokenizer, text, max_length, stride)
+        tokenize_span.set(tokens=sum(len(ids) for ids, _ in chunks), chunks=len(chunks))
+    with _tokenization_lock:
+        _tokenization_cache[key] = (text, chunks)
+    return chunks
+
+
+def classify_articles(
+    tokenizer,
+    model,
+    device: str,
+    articles: List[TranslatedArticles],
+    activation: str = "softmax",
+    max_length: int = 512,
+    stride: int = 50,
+    batch_size: int = None,
+    run_id: Optional[str] = None
+) -> List["torch.Tensor"]:
+    """
+    Runs a sequence-classification model over the overflow chunks of all articles
+    (see forward_chunks), then regroups the chunk scores by article and averages them.
+    With shared batching enabled, the chunks may be batched with those of concurrent runs;
+    run_id keeps their cached encodings apart. Returns one score vector per article, in the order of `articles`.
+    """
+    import torch
+
+    batch_size = batch_size or _batch_size
+
+    # (article index, input_ids, attention_mask) for every chunk of every article
+    chunks = []
+    for idx, article in enumerate(articles):
+        for input_ids, attention_mask in cached_article_chunks(tokenizer, article, max_length, stride, run_id):
+            chunks.append((idx, input_ids, attention_mask))
+
+    def forward(all_chunks: list) -> List["torch.Tensor"]:
+        return forward_chunks(tokenizer, model, device, all_chunks, activation, batch_size)
+
+    if _batcher is not None and chunks:
+        scores = _batcher.run((id(model), activation), chunks, forward)
+    else:
+        scores = forward(chunks)
+
+    chunk_scores: List[List["torch.Tensor"]] = [[] for _ in articles]
+    for (article_idx, _, _), probs in zip(chunks, scores):
+        chunk_scores[article_idx].append(probs)
+    return [torch.mean(torch.stack(scores), dim=0) for scores in chunk_scores]
+
+
+def forward_chunks(tokenizer, model, device: str, chunks: list, activation: str, batch_size: int) -> List["torch.Tensor"]:
+    """
+    Scores (_, input_ids, attention_mask) chunks. Chunks are sorted by length and sent
+    through the model in batches padded only to the longest chunk in the batch.
+    Returns one probability vector per chunk, in the order of `chunks`.
+    """
+    import torch
+    import torch.nn.functional as F
+
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i][1]))
+    scores: List["torch.Tensor"] = [None] * len(chunks)
+
+    total = len(order)
+    model_id = getattr(model, "name_or_path", type(model).__name__)
+    for start in range(0, total, batch_size):
+        indices = order[start:start + batch_size]
+        batch = [chunks[i] for i in indices]
+        inputs = tokenizer.pad(
+            {"input_ids": [c[1] for c in batch], "attention_mask": [c[2] for c in batch]},
+            padding="longest",
+            return_tensors="pt"
+        ).to(device)
+
+        with span(
+            "forward", "encoder", model=model_id, batch_size=len(batch),
+            tokens=sum(len(c[1]) for c in batch), padded_tokens=int(inputs["input_ids"].numel())
+        ), torch.no_grad():
+            logits = model(**inputs).logits
+            if activation == "sigmoid":
+                probs = torch.sigmoid(logits)
+            else:
+                probs = F.softmax(logits, dim=-1)
+            probs = probs.cpu()
+
+        for row, i in enumerate(indices):
+            scores[i] = probs[row]
+
+        done = min(start + batch_size, total)
+        print(f"\rProgress: {(done / total) * 100:.1f}% ({done}/{total} chunks)", end="", flush=True)
+
+    return scores
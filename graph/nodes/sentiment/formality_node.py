@@ -1,8 +1,9 @@
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from graph.state_definitions import GraphState, TranslatedArticles, ModelResult
-from typing import List, Dict
-import torch.nn.functional as F
+from graph.dedup import copy_duplicate_results
+from graph.model_registry import get_model
+from graph.nodes.sentiment.encoder_inference import classify_articles
+from graph.results_store import ResultsStore, as_results_store
+from graph.state_definitions import GraphState, TranslatedArticles
+from typing import List
 
 def formality_node(state: GraphState, debug: bool = False) -> GraphState:
     """
@@ -17,79 +18,48 @@ def formality_node(state: GraphState, debug: bool = False) -> GraphState:
             print("❗ No translated articles found. Skipping formality analysis.")
         return {}
 
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    if debug:
-        print(f"   🖥 Using device: {device}")
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
     model_path = "cointegrated/roberta-base-formality"
-    tokenizer = AutoTokenizer.from_pretrained(model_path)
-    model = AutoModelForSequenceClassification.from_pretrained(
-        model_path, trust_remote_code=True
-    ).to(device)
+    tokenizer, model, device = get_model(
+        model_path, AutoModelForSequenceClassification, AutoTokenizer, quantize=True, onnx=True, trust_remote_code=True
+    )
+    if debug:
+        print(f"   🖥 Using device: {device}")
 
     max_length = 512
     class_labels = ["formal", "informal"]
 
-    existing_results = state.get("results", [])
-    existing_ids_for_model = {r["article_id"] for r in existing_results if r.get("model") == model_path}
-
-    new_results: List[ModelResult] = []
-
-    total = len(translated_articles)
-    processed_count = 0
-
-    for article in translated_articles:
-        if article["article_id"] in existing_ids_for_model:
-            processed_count += 1
-            if debug:
-                percent = (processed_count / total) * 100
-                print(f"\rProgress: {percent:.1f}% ({processed_count}/{total})", end="", flush=True)
-            continue
-
-        text = article.get("text_en", "")
-        if not text.strip():
-            processed_count += 1
-            if debug:
-                percent = (processed_count / total) * 100
-                print(f"\rProgress: {percent:.1f}% ({processed_count}/{total})", end="", flush=True)
-            continue
-
-        encodings = tokenizer(
-            text,
-            truncation=True,
-            max_length=max_length,
-            stride=50,
-            return_overflowing_tokens=True,
-            padding=False
-        )
-
-        all_scores = []
-        for input_ids, attention_mask in zip(encodings["input_ids"], encodings["attention_mask"]):
-            inputs = tokenizer.pad(
-                {"input_ids": [input_ids], "attention_mask": [attention_mask]},
-                padding="max_length",
-                max_length=max_length,
-                return_tensors="pt"
-            ).to(device)
-
-            with torch.no_grad():
-                logits = model(**inputs).logits
-                probs = F.softmax(logits, dim=-1)
-                all_scores.append(probs.cpu())
-
-        avg_scores = torch.mean(torch.stack(all_scores), dim=0).squeeze(0)
-        score_dict: Dict[str, float] = {cls: float(avg_scores[i]) for i, cls in enumerate(class_labels)}
-
-        new_results.append({
-            "article_id": article["article_id"],
-            "source_language": article.get("source_language", "unknown"),
-            "model": model_path,
-            "score": score_dict
-        })
-
-        processed_count += 1
-        percent = (processed_count / total) * 100
-        print(f"\rProgress: {percent:.1f}% ({processed_count}/{total})", end="", flush=True)
+    results_store = as_results_store(state.get("results"))
+
+    duplicates = state.get("duplicates", {})
+    pending = [
+        article for article in translated_articles
+        if not results_store.contains(model_path, article["article_id"])
+        and article["article_id"] not in duplicates
+        and article.get("text_en", "").strip()
+    ]
+    article_scores = classify_articles(
+        tokenizer, model, device, pending, activation="softmax", max_length=max_length, run_id=state.get("run_id")
+    )
+
+    new_results = ResultsStore()
+    new_results.add(
+        model_path,
+        class_labels,
+        [article["article_id"] for article in pending],
+        [article.get("source_language", "unknown") for article in pending],
+        [avg_scores.numpy() for avg_scores in article_scores]
+    )
+
+    # Near-duplicate articles reuse the scores of their canonical article
+    copy_duplicate_results(
+        new_results,
+        results_store,
+        model_path,
+        duplicates,
+        {a["article_id"]: a.get("source_language", "unknown") for a in translated_articles}
+    )
 
     if debug:
         print()
@@ -1,7 +1,10 @@
-import torch
-from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
+from graph.dedup import ArticleDeduplicator
 from graph.state_definitions import GraphState, RawArticle, TranslatedArticles
-from typing import List
+from graph.translation import translate_sentences
+from graph.translation_engine import get_translation_engine
+from graph.translation_cache import get_translation_cache
+from collections import defaultdict
+from typing import Dict, List, Optional
 import re
 
 def split_into_sentences(text: str) -> List[str]:
@@ -9,7 +12,12 @@ def split_into_sentences(text: str) -> List[str]:
     sentences = re.split(r'(?<=[.!?]) +', text.strip())
     return [s for s in sentences if s]
 
-def translate_to_en_node(state: GraphState) -> GraphState:
+def translate_to_en_node(state: GraphState, dedup: Optional[ArticleDeduplicator] = None) -> GraphState:
+    """
+    Translates raw articles to English, skipping near-duplicates. `dedup` keeps the
+    duplicate indexes across calls (streaming micro-batches); raw_articles then holds
+    only the new articles. Without it every raw article is indexed again.
+    """
     print("\n🌍 NODE: translate_articles_node (IMPROVED, NO REPETITION)")
 
     raw_articles: list[RawArticle] = state.get("raw_articles", [])
@@ -17,70 +25,87 @@ def translate_to_en_node(state: GraphState) -> GraphState:
         print("❗ No raw articles to translate. Skipping.")
         return {}
 
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    model_path = "models/translation/m2m100_418M"
+    from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
 
-    tokenizer = M2M100Tokenizer.from_pretrained(model_path)
-    model = M2M100ForConditionalGeneration.from_pretrained(model_path).to(device)
-    model.eval()
+    model_path = "models/translation/m2m100_418M"
+    tokenizer, engine = get_translation_engine(model_path, M2M100ForConditionalGeneration, M2M100Tokenizer)
 
-    translated_entries: list[TranslatedArticles] = []
-    existing_ids = {a["article_id"] for a in state.get("translated_articles", [])}
+    existing_translations = {a["article_id"]: a["text_en"] for a in state.get("translated_articles", [])}
 
-    total = len(raw_articles)
-    translated_count = 0
+    # Near-duplicates of an earlier article (wire copies) are not translated again
+    dedup = dedup if dedup is not None else ArticleDeduplicator()
+    raw_duplicates = {}
+    for article in raw_articles:
+        canonical = dedup.add_raw(article["article_id"], article["text"])
+        if canonical is not None:
+            raw_duplicates[article["article_id"]] = canonical
 
-    for idx, article in enumerate(raw_articles):
-        article_id = article["article_id"]
-        source_lang = article["language"]
-        text = article["text"]
+    # Articles still to translate, and the unique sentences of each source language
+    pending: list[RawArticle] = []
+    article_sentences: List[List[str]] = []
+    sentences_by_lang: Dict[str, Dict[str, None]] = defaultdict(dict)
 
-        if article_id in existing_ids:
-            translated_count += 1
-            percent = (translated_count / total) * 100
-            print(f"\rProgress: {percent:.1f}% ({translated_count}/{total})", end="", flush=True)
+    for article in raw_articles:
+        if article["article_id"] in existing_translations:
             continue
+        translate = article["language"] != "en" and article["article_id"] not in raw_duplicates
+        sentences = split_into_sentences(article["text"]) if translate else []
+        pending.append(article)
+        article_sentences.append(sentences)
+        for sentence in sentences:
+            sentences_by_lang[article["language"]][sentence] = None
 
-        if source_lang == "en":
-            translated_entries.append({
-                "article_id": article_id,
-                "source_language": "en",
-                "text_en": text
-            })
-            translated_count += 1
-            percent = (translated_count / total) * 100
-            print(f"\rProgress: {percent:.1f}% ({translated_count}/{total})", end="", flush=True)
-            continue
+    total = sum(len(sentences) for sentences in sentences_by_lang.values())
+    translated_count = 0
 
-        tokenizer.src_lang = source_lang
-        sentences = split_into_sentences(text)
+    def report_progress(batch_size: int):
+        nonlocal translated_count
+        translated_count += batch_size
+        percent = (translated_count / total) * 100
+        print(f"\rProgress: {percent:.1f}% ({translated_count}/{total} sentences)", end="", flush=True)
 
-        translated_parts = []
-        for sentence in sentences:
-            encoded = tokenizer(sentence, return_tensors="pt", truncation=True, max_length=tokenizer.model_max_length).to(device)
-            with torch.no_grad():
-                generated = model.generate(
-                    **encoded,
-                    forced_bos_token_id=tokenizer.get_lang_id("en"),
-                    max_new_tokens=min(128, encoded.input_ids.shape[1]*2),
-                    no_repeat_ngram_size=3,
-                    repetition_penalty=2.0,
-                    early_stopping=True
-                )
-            decoded = tokenizer.batch_decode(generated, skip_special_tokens=True)
-            translated_parts.append(decoded[0])
-
-        translated_text = " ".join(translated_parts)
+    translations: Dict[str, Dict[str, str]] = {}
+    for source_lang, sentences in sentences_by_lang.items():
+        unique_sentences = list(sentences)
+        translated = translate_sentences(
+            tokenizer, engine, unique_sentences, source_lang, "en", on_batch_done=report_progress
+        )
+        translations[source_lang] = dict(zip(unique_sentences, translated))
+
+    translated_entries: list[TranslatedArticles] = []
+    translated_by_id = dict(existing_translations)
+    for article, sentences in zip(pending, article_sentences):
+        source_lang = article["language"]
+        if article["article_id"] in raw_duplicates:
+            canonical = raw_duplicates[article["article_id"]]
+            text_en = translated_by_id.get(canonical, dedup.texts_en.get(canonical, ""))
+        elif source_lang == "en":
+            text_en = article["text"]
+        else:
+            text_en = " ".join(translations[source_lang][s] for s in sentences)
+
+        translated_by_id[article["article_id"]] = text_en
         translated_entries.append({
-            "article_id": article_id,
+            "article_id": article["article_id"],
             "source_language": source_lang,
-            "text_en": translated_text
+            "text_en": text_en
         })
 
-        translated_count += 1
-        percent = (translated_count / total) * 100
-        print(f"\rProgress: {percent:.1f}% ({translated_count}/{total})", end="", flush=True)
-
     print()
 
-    return {"translated_articles": translated_entries}
+    # Second pass on English text catches the same story published in different languages
+    for article_id, text_en in translated_by_id.items():
+        if article_id not in raw_duplicates:
+            dedup.add_english(article_id, text_en)
+    duplicates = {
+        a["article_id"]: dedup.duplicates[a["article_id"]] for a in raw_articles if a["article_id"] in dedup.duplicates
+    }
+    if duplicates:
+        print(f"   🧬 Near-duplicate articles: {len(duplicates)} (results copied from the canonical article)")
+
+    cache = get_translation_cache()
+    if cache is not None:
+        stats = cache.stats()
+        print(f"   💾 Translation cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+
+    return {"translated_articles": translated_entries, "duplicates": duplicates}
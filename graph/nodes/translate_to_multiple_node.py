@@ -1,10 +1,42 @@
-from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
 from graph.state_definitions import GraphState, InputText
+from graph.translation import translate_rows
+from graph.translation_engine import engine_cache_params, get_translation_engine
+from graph.translation_cache import get_translation_cache
+from typing import Dict, List, Tuple
+
+MODEL_PATH = "models/translation/m2m100_418M"
+
+def translate_queries(rows: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+    """
+    Translates English (text, target language) rows. Rows found in the translation
+    cache are reused; the rest are decoded in one batched generate call.
+    """
+    cache = get_translation_cache()
+    cache_params = engine_cache_params()
+    translations: Dict[Tuple[str, str], str] = {}
+    if cache is not None:
+        for text, lang in rows:
+            cached = cache.get_many(MODEL_PATH, cache_params, "en", lang, [text])
+            if text in cached:
+                translations[(text, lang)] = cached[text]
+
+    missing = [row for row in dict.fromkeys(rows) if row not in translations]
+    if missing:
+        from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
+
+        tokenizer, engine = get_translation_engine(MODEL_PATH, M2M100ForConditionalGeneration, M2M100Tokenizer)
+        decoded = translate_rows(tokenizer, engine, missing, "en")
+        for (text, lang), translated_text in zip(missing, decoded):
+            translations[(text, lang)] = translated_text
+            if cache is not None:
+                cache.put_many(MODEL_PATH, cache_params, "en", lang, [(text, translated_text)])
+    return translations
+
 
 def translate_to_multiple_node(state: GraphState) -> GraphState:
     """
     Uses the M2M100 model to translate the English input text into all selected languages
-    except English itself.
+    except English itself, in a single batched generate call (see translate_queries).
     Each translation is appended as a new InputText entry in state['input_text'].
     """
     print("\n🌍 NODE: translate_to_multiple_node")
@@ -12,27 +44,20 @@ def translate_to_multiple_node(state: GraphState) -> GraphState:
     english_texts = [item for item in state["input_text"] if item["language"] == "en"]
     if not english_texts:
         print("❗ No English input text found. Skipping translation.")
-        return state
+        return {}
 
     source_text = english_texts[0]["text"]
     target_languages = [lang for lang in state["selected_languages"] if lang != "en"]
     print(f"   📝 Source text (EN): '{source_text}'")
     print(f"   🌎 Target languages (excluding EN): {', '.join(target_languages)}")
 
-    # --- Load local translation model ---
-    model_path = "models/translation/m2m100_418M"
-    tokenizer = M2M100Tokenizer.from_pretrained(model_path)
-    model = M2M100ForConditionalGeneration.from_pretrained(model_path)
+    translated = translate_queries([(source_text, lang) for lang in target_languages])
+    translations = {lang: translated[(source_text, lang)] for lang in target_languages}
 
     translated_entries: list[InputText] = []
 
     for lang in target_languages:
-        tokenizer.src_lang = "en"
-
-        encoded = tokenizer(source_text, return_tensors="pt")
-        generated_tokens = model.generate(**encoded, forced_bos_token_id=tokenizer.get_lang_id(lang))
-        translated_text = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)[0]
-
+        translated_text = translations[lang]
         translated_entries.append({
             "language": lang,
             "text": translated_text
@@ -41,4 +66,4 @@ def translate_to_multiple_node(state: GraphState) -> GraphState:
         print(f"   ✓ Translated to {lang}: {translated_text[:80]}...")
 
     updated_input_text = state["input_text"] + translated_entries
-    return {**state, "input_text": updated_input_text}
+    return {"input_text": updated_input_text}
@@ -0,0 +1,176 @@
+import os
+import threading
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import torch
+
+BACKENDS = ("torch", "onnx")
+DEFAULT_CACHE_DIR = "cache/onnx"
+MAX_SEQUENCE_LENGTH = 512
+
+_settings = {"backend": "torch", "cache_dir": DEFAULT_CACHE_DIR, "threads": None}
+_export_lock = threading.Lock()
+
+
+def configure_backend(backend: str = "torch", cache_dir: str = DEFAULT_CACHE_DIR, threads: Optional[int] = None) -> None:
+    """
+    backend: 'torch' or 'onnx' for the sequence-classification analyzers on CPU.
+    threads: ONNX Runtime intra-op threads (default: ONNX Runtime's choice).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    _settings["backend"] = backend
+    _settings["cache_dir"] = cache_dir
+    _settings["threads"] = threads
+
+
+def onnx_enabled() -> bool:
+    return _settings["backend"] == "onnx"
+
+
+def onnx_file_path(model_path: str, quantized: bool = False) -> str:
+    """
+    The exported file lives next to local models (<model>/onnx/). Hub models are cached
+    under cache/onnx, since writing into ./<org>/<name> would shadow the Hub ID.
+    """
+    name = "model.int8.onnx" if quantized else "model.onnx"
+    if os.path.isdir(model_path):
+        return os.path.join(model_path, "onnx", name)
+    return os.path.join(_settings["cache_dir"], model_path.replace("/", "--"), name)
+
+
+def _logits_only(model: Any) -> "torch.nn.Module":
+    """Wraps the classifier so that the exported graph returns the logits only."""
+    import torch
+
+    class LogitsOnly(torch.nn.Module):
+        def __init__(self, model: Any):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask):
+            return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+    return LogitsOnly(model).eval()
+
+
+def export_to_onnx(model_path: str, model_cls: Any, tokenizer: Any, path: str, **model_kwargs) -> None:
+    """
+    Exports the classifier with dynamic batch and sequence axes (torch.export based
+    exporter). Inputs are input_ids and attention_mask only, as forward_chunks passes
+    them; models with token type embeddings (BERT, DeBERTa) then use type 0 throughout.
+    """
+    import torch
+    from torch.export import Dim
+
+    model = model_cls.from_pretrained(model_path, **model_kwargs)
+    model.eval()
+    sample = tokenizer(["An example sentence for export.", "A second, somewhat longer example sentence for export."],
+                       padding=True, return_tensors="pt")
+    input_names = ["input_ids", "attention_mask"]
+
+    batch, sequence = Dim("batch"), Dim("sequence", max=MAX_SEQUENCE_LENGTH)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp.onnx"
+    torch.onnx.export(
+        _logits_only(model),
+        tuple(sample[name] for name in input_names),
+        tmp_path,
+        input_names=input_names,
+        output_names=["logits"],
+        dynamic_shapes={name: {0: batch, 1: sequence} for name in input_names},
+        dynamo=True,
+        external_data=False
+    )
+    os.replace(tmp_path, path)
+
+
+def quantize_onnx(source: str, path: str) -> None:
+    """Dynamic int8 quantization of the exported model's MatMul/Gemm weights."""
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp_path = f"{path}.{threading.get_ident()}.tmp.onnx"
+    prepared_path = f"{tmp_path}.prepared.onnx"
+    # Shape annotations left by the exporter can disagree with re-inferred ones; let the quantizer infer them
+    model = onnx.load(source)
+    model.graph.ClearField("value_info")
+    onnx.save(model, prepared_path)
+    try:
+        quantize_dynamic(prepared_path, tmp_path, weight_type=QuantType.QInt8)
+    finally:
+        os.remove(prepared_path)
+    os.replace(tmp_path, path)
+
+
+class OnnxSequenceClassifier:
+    """
+    Drop-in for an AutoModelForSequenceClassification in classify_articles: called with
+    the tokenizer's tensors, returns an object with .logits. Runs on ONNX Runtime's CPU
+    provider with all graph optimizations and binds inputs/outputs with IO binding.
+    """
+
+    def __init__(self, path: str, config: Any, name_or_path: str, threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.config = config
+        self.name_or_path = name_or_path
+        self.path = path
+
+    def __call__(self, **inputs) -> SimpleNamespace:
+        import torch
+
+        arrays = {
+            name: np.ascontiguousarray(value.cpu().numpy() if isinstance(value, torch.Tensor) else value, dtype=np.int64)
+            for name, value in inputs.items()
+        }
+        if "token_type_ids" in self.input_names and "token_type_ids" not in arrays:
+            # Exports made before token_type_ids was dropped still declare it
+            arrays["token_type_ids"] = np.zeros_like(arrays["input_ids"])
+
+        binding = self.session.io_binding()
+        for name in self.input_names:
+            binding.bind_cpu_input(name, arrays[name])
+        binding.bind_output("logits", "cpu")
+        self.session.run_with_iobinding(binding)
+        return SimpleNamespace(logits=torch.from_numpy(binding.copy_outputs_to_cpu()[0]))
+
+    def eval(self) -> "OnnxSequenceClassifier":
+        return self
+
+    def to(self, device) -> "OnnxSequenceClassifier":
+        return self
+
+
+def load_onnx_model(model_path: str, model_cls: Any, tokenizer: Any, quantized: bool = False, **model_kwargs) -> Tuple[Any, int]:
+    """
+    Returns (OnnxSequenceClassifier, file size) for model_path, exporting (and with
+    quantized=True, int8-quantizing) the model on first use.
+    """
+    from transformers import AutoConfig
+
+    from graph.model_registry import is_stale  # model_registry imports this module
+
+    fp32_path = onnx_file_path(model_path)
+    path = onnx_file_path(model_path, quantized)
+    with _export_lock:
+        if is_stale(fp32_path, model_path):
+            print(f"   🔁 Exporting '{model_path}' to ONNX")
+            export_to_onnx(model_path, model_cls, tokenizer, fp32_path, **model_kwargs)
+        if quantized and (not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(fp32_path)):
+            print(f"   🧮 Quantizing ONNX model of '{model_path}' to int8")
+            quantize_onnx(fp32_path, path)
+
+    config = AutoConfig.from_pretrained(model_path, trust_remote_code=model_kwargs.get("trust_remote_code", False))
+    model = OnnxSequenceClassifier(path, config, model_path, _settings["threads"])
+    return model, os.path.getsize(path)
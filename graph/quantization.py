@@ -0,0 +1,102 @@
+import hashlib
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+if TYPE_CHECKING:
+    import torch
+
+DEFAULT_CACHE_DIR = "cache/quantized"
+
+_settings = {"enabled": False, "cache_dir": DEFAULT_CACHE_DIR}
+_lock = threading.Lock()
+
+
+def configure_quantization(enabled: bool = False, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+    """
+    enabled: encoder analyzers running on CPU use dynamic int8 quantized Linear layers.
+    Quantized models are cached in cache_dir, so later runs skip loading the fp32 weights.
+    """
+    _settings["enabled"] = enabled
+    _settings["cache_dir"] = cache_dir
+
+
+def quantization_enabled() -> bool:
+    return _settings["enabled"]
+
+
+def quantize_dynamic_int8(model: Any) -> Any:
+    """Replaces every nn.Linear with a dynamically quantized int8 Linear (weights int8, activations fp32)."""
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+
+    return quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _source_fingerprint(model_path: str) -> str:
+    """Changes when the fp32 weights change: file sizes and mtimes for local directories, the ID for Hub models."""
+    if not os.path.isdir(model_path):
+        return model_path
+    parts = []
+    for name in sorted(os.listdir(model_path)):
+        path = os.path.join(model_path, name)
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            parts.append(f"{name}:{stat.st_size}:{int(stat.st_mtime)}")
+    return "|".join(parts)
+
+
+def quantized_cache_path(model_path: str, model_cls: Any) -> str:
+    import torch
+    import transformers
+
+    key = "\n".join([
+        model_path, getattr(model_cls, "__name__", str(model_cls)), _source_fingerprint(model_path),
+        torch.__version__, transformers.__version__, torch.backends.quantized.engine
+    ])
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    slug = model_path.replace("/", "--")[-60:]
+    return os.path.join(_settings["cache_dir"], f"{slug}-{digest[:16]}.pt")
+
+
+def load_quantized_model(model_path: str, model_cls: Any, **model_kwargs) -> Tuple[Any, int]:
+    """
+    Returns (int8 model, size in bytes) for model_path on CPU. Loads the cached quantized
+    module when present, otherwise quantizes the fp32 model and writes the cache.
+    """
+    import torch
+
+    path = quantized_cache_path(model_path, model_cls)
+    with _lock:
+        if os.path.exists(path):
+            try:
+                # The file was written by this module; it holds a pickled nn.Module
+                model = torch.load(path, map_location="cpu", weights_only=False)
+                model.eval()
+                return model, os.path.getsize(path)
+            except Exception as e:
+                print(f"   ⚠️ Ignoring unreadable quantized cache '{path}': {e}")
+
+        print(f"   🧮 Quantizing '{model_path}' to int8")
+        model = model_cls.from_pretrained(model_path, **model_kwargs)
+        model.eval()
+        model = quantize_dynamic_int8(model)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            torch.save(model, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"   ⚠️ Could not cache quantized model: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        return model, size
+
+
+def quantization_key(quantize: bool, device: str, dtype: Optional["torch.dtype"]) -> Optional[str]:
+    """Registry dtype key for a quantized load, or None when the fp32/dtype path applies."""
+    if quantize and quantization_enabled() and device == "cpu" and dtype is None:
+        return "qint8"
+    return None
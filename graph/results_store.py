@@ -0,0 +1,366 @@
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from graph.state_definitions import ModelResult
+
+
+@dataclass
+class ModelBlock:
+    """
+    Results of one model, one row per article:
+    - article_idx: index into ResultsStore.article_table
+    - language_idx: index into ResultsStore.language_table
+    - probs: (rows, labels) float32 score matrix
+    - duplicate_of: article_table index of the canonical article, or -1
+    """
+    labels: List[str]
+    article_idx: np.ndarray
+    language_idx: np.ndarray
+    probs: np.ndarray
+    duplicate_of: np.ndarray
+
+    def __post_init__(self):
+        # Not a dataclass field, so checkpoints keep only the arrays above
+        self._rows: Optional[_RowBuffer] = None
+
+    def _buffer(self) -> "_RowBuffer":
+        if self._rows is None:
+            self._rows = _RowBuffer(self, len(self.article_idx))
+        return self._rows
+
+    def row_of(self, article_idx: int) -> Optional[int]:
+        """Row of an article_table index in this block, or None."""
+        row = self._buffer().index.get(article_idx)
+        return row if row is not None and row < len(self.article_idx) else None
+
+    def append(self, article_idx: np.ndarray, language_idx: np.ndarray, probs: np.ndarray, duplicate_of: np.ndarray) -> "ModelBlock":
+        """
+        Returns a block with the rows of this one followed by the given rows. The
+        arrays grow with amortized doubling, so appending batch after batch copies
+        every row O(1) times instead of once per batch; this block is unchanged.
+        """
+        size, count = len(self.article_idx), len(article_idx)
+        buffer = self._buffer()
+        if not buffer.claim(size, count):
+            buffer = _RowBuffer(self, max(2 * (size + count), 16))
+            buffer.claim(size, count)
+        end = size + count
+        buffer.article_idx[size:end] = article_idx
+        buffer.language_idx[size:end] = language_idx
+        buffer.probs[size:end] = probs
+        buffer.duplicate_of[size:end] = duplicate_of
+        for row, idx in enumerate(article_idx.tolist(), size):
+            buffer.index.setdefault(idx, row)
+
+        block = ModelBlock(
+            labels=self.labels,
+            article_idx=buffer.article_idx[:end],
+            language_idx=buffer.language_idx[:end],
+            probs=buffer.probs[:end],
+            duplicate_of=buffer.duplicate_of[:end]
+        )
+        block._rows = buffer
+        return block
+
+
+class _RowBuffer:
+    """
+    Storage behind the blocks of one model. Blocks of stores derived from each
+    other (add, merge) view prefixes of the same arrays. Only a block ending at the
+    last used row may append in place; any other block copies first, so rows a
+    block already shows never change. `index` maps article_table index -> first row.
+    """
+
+    def __init__(self, block: ModelBlock, capacity: int):
+        size = len(block.article_idx)
+        if capacity == size:
+            self.article_idx, self.language_idx = block.article_idx, block.language_idx
+            self.probs, self.duplicate_of = block.probs, block.duplicate_of
+        else:
+            self.article_idx = np.empty(capacity, dtype=np.int32)
+            self.language_idx = np.empty(capacity, dtype=np.int16)
+            self.probs = np.empty((capacity, len(block.labels)), dtype=np.float32)
+            self.duplicate_of = np.empty(capacity, dtype=np.int32)
+            self.article_idx[:size] = block.article_idx
+            self.language_idx[:size] = block.language_idx
+            self.probs[:size] = block.probs
+            self.duplicate_of[:size] = block.duplicate_of
+        self.used = size
+        self.index: Dict[int, int] = {}
+        for row, idx in enumerate(block.article_idx.tolist()):
+            self.index.setdefault(idx, row)
+        self._lock = threading.Lock()
+
+    def claim(self, size: int, count: int) -> bool:
+        """Reserves rows size..size+count for a block of `size` rows, if it ends at the last used row."""
+        with self._lock:
+            if self.used != size or size + count > len(self.article_idx):
+                return False
+            self.used = size + count
+            return True
+
+
+def _empty_block(labels: Sequence[str]) -> ModelBlock:
+    return ModelBlock(
+        labels=list(labels),
+        article_idx=np.zeros(0, dtype=np.int32),
+        language_idx=np.zeros(0, dtype=np.int16),
+        probs=np.zeros((0, len(labels)), dtype=np.float32),
+        duplicate_of=np.zeros(0, dtype=np.int32)
+    )
+
+
+@dataclass
+class ResultsStore:
+    """
+    Columnar store of analyzer results. Article IDs and languages are interned in
+    tables, and every model keeps its rows as NumPy arrays. Lookups by
+    (model, article_id) go through an index per model that grows with its rows.
+    Stores returned by merge share the append-only tables of the store they came
+    from, so a table may list IDs that only a related store has rows for.
+    """
+    article_table: List[str] = field(default_factory=list)
+    language_table: List[str] = field(default_factory=list)
+    blocks: Dict[str, ModelBlock] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._article_lookup = {a: i for i, a in enumerate(self.article_table)}
+        self._language_lookup = {l: i for i, l in enumerate(self.language_table)}
+
+    # --- interning ---
+    def _article(self, article_id: str) -> int:
+        idx = self._article_lookup.get(article_id)
+        if idx is None:
+            idx = self._article_lookup[article_id] = len(self.article_table)
+            self.article_table.append(article_id)
+        return idx
+
+    def _language(self, language: str) -> int:
+        idx = self._language_lookup.get(language)
+        if idx is None:
+            idx = self._language_lookup[language] = len(self.language_table)
+            self.language_table.append(language)
+        return idx
+
+    def _derive(self) -> "ResultsStore":
+        """A store with the rows of self that shares its tables and blocks."""
+        derived = ResultsStore.__new__(ResultsStore)
+        derived.article_table, derived.language_table = self.article_table, self.language_table
+        derived._article_lookup, derived._language_lookup = self._article_lookup, self._language_lookup
+        derived.blocks = dict(self.blocks)
+        return derived
+
+    # --- writing ---
+    def add(
+        self,
+        model: str,
+        labels: Sequence[str],
+        article_ids: Sequence[str],
+        languages: Sequence[str],
+        probs,
+        duplicate_of: Optional[Sequence[Optional[str]]] = None
+    ) -> None:
+        """Appends one row per article to the block of `model`."""
+        if not len(article_ids):
+            return
+        probs = np.asarray(probs, dtype=np.float32).reshape(len(article_ids), len(labels))
+        duplicate_of = duplicate_of or [None] * len(article_ids)
+
+        block = self.blocks.get(model) or _empty_block(labels)
+        if list(block.labels) != list(labels):
+            raise ValueError(f"Labels of model '{model}' changed: {block.labels} -> {list(labels)}")
+
+        self.blocks[model] = block.append(
+            np.array([self._article(a) for a in article_ids], dtype=np.int32),
+            np.array([self._language(l) for l in languages], dtype=np.int16),
+            probs,
+            np.array([self._article(d) if d else -1 for d in duplicate_of], dtype=np.int32)
+        )
+
+    def merge(self, other: "ResultsStore") -> "ResultsStore":
+        """Returns a new store with the rows of self followed by the rows of other."""
+        # Tables are append-only and blocks never change the rows they show, so
+        # merging costs O(rows of other) however large self is
+        merged = self._derive()
+        article_map = np.array([merged._article(a) for a in other.article_table], dtype=np.int32)
+        language_map = np.array([merged._language(l) for l in other.language_table], dtype=np.int16)
+
+        for model, block in other.blocks.items():
+            base = merged.blocks.get(model) or _empty_block(block.labels)
+            if list(base.labels) != list(block.labels):
+                raise ValueError(f"Labels of model '{model}' changed: {base.labels} -> {list(block.labels)}")
+            duplicate_of = block.duplicate_of
+            if len(duplicate_of):
+                duplicate_of = np.where(duplicate_of >= 0, article_map[np.maximum(duplicate_of, 0)], -1).astype(np.int32)
+            merged.blocks[model] = base.append(
+                article_map[block.article_idx], language_map[block.language_idx], block.probs, duplicate_of
+            )
+        return merged
+
+    def subset(self, article_ids: Iterable[str]) -> "ResultsStore":
+        """
+        Returns a new store with only the rows of article_ids. Links to canonical
+        articles outside the subset are dropped, so those rows count as originals.
+        """
+        keep = sorted({self._article_lookup[a] for a in article_ids if a in self._article_lookup})
+        article_map = np.full(len(self.article_table), -1, dtype=np.int32)
+        article_map[keep] = np.arange(len(keep), dtype=np.int32)
+
+        subset = ResultsStore([self.article_table[i] for i in keep], list(self.language_table))
+        for model, block in self.blocks.items():
+            mask = article_map[block.article_idx] >= 0
+            duplicate_of = block.duplicate_of[mask]
+            if len(duplicate_of):
+                duplicate_of = np.where(duplicate_of >= 0, article_map[np.maximum(duplicate_of, 0)], -1).astype(np.int32)
+            subset.blocks[model] = ModelBlock(
+                labels=block.labels,
+                article_idx=article_map[block.article_idx[mask]],
+                language_idx=block.language_idx[mask],
+                probs=block.probs[mask],
+                duplicate_of=duplicate_of
+            )
+        return subset
+
+    # --- reading ---
+    def _row(self, model: str, article_id: str) -> Optional[int]:
+        idx = self._article_lookup.get(article_id)
+        block = self.blocks.get(model)
+        return block.row_of(idx) if idx is not None and block is not None else None
+
+    def contains(self, model: str, article_id: str) -> bool:
+        return self._row(model, article_id) is not None
+
+    def article_ids(self, model: str) -> Set[str]:
+        block = self.blocks.get(model)
+        if block is None:
+            return set()
+        return {self.article_table[i] for i in block.article_idx}
+
+    def scores(self, model: str, article_id: str) -> Optional[Dict[str, float]]:
+        row = self._row(model, article_id)
+        if row is None:
+            return None
+        block = self.blocks[model]
+        return {label: float(v) for label, v in zip(block.labels, block.probs[row])}
+
+    def __len__(self) -> int:
+        return sum(len(block.article_idx) for block in self.blocks.values())
+
+    # --- conversion ---
+    def to_records(self) -> List["ModelResult"]:
+        return list(self.iter_records())
+
+    def iter_records(self) -> Iterator["ModelResult"]:
+        """Yields one ModelResult per row without materializing the whole list."""
+        for model, block in self.blocks.items():
+            for row in range(len(block.article_idx)):
+                record = {
+                    "article_id": self.article_table[block.article_idx[row]],
+                    "source_language": self.language_table[block.language_idx[row]],
+                    "model": model,
+                    "score": {label: float(v) for label, v in zip(block.labels, block.probs[row])}
+                }
+                if block.duplicate_of[row] >= 0:
+                    record["duplicate_of"] = self.article_table[block.duplicate_of[row]]
+                yield record
+
+    @classmethod
+    def from_records(cls, records: Iterable["ModelResult"]) -> "ResultsStore":
+        by_model: Dict[str, List["ModelResult"]] = {}
+        for r in records:
+            by_model.setdefault(r["model"], []).append(r)
+
+        store = cls()
+        for model, rows in by_model.items():
+            scores = [r["score"] if isinstance(r["score"], dict) else {"": r["score"]} for r in rows]
+            labels = list(scores[0])
+            store.add(
+                model,
+                labels,
+                [r["article_id"] for r in rows],
+                [r["source_language"] for r in rows],
+                [[float(score.get(label, 0.0)) for label in labels] for score in scores],
+                [r.get("duplicate_of") for r in rows]
+            )
+        return store
+
+    def save_npz(self, path: str) -> None:
+        """
+        Binary columnar sidecar: the interned tables plus, for every model i, the arrays
+        m{i}_labels, m{i}_article_idx, m{i}_language_idx, m{i}_probs and m{i}_duplicate_of.
+        """
+        arrays = {
+            "models": np.array(list(self.blocks), dtype=np.str_),
+            "article_table": np.array(self.article_table, dtype=np.str_),
+            "language_table": np.array(self.language_table, dtype=np.str_)
+        }
+        for i, block in enumerate(self.blocks.values()):
+            arrays[f"m{i}_labels"] = np.array(block.labels, dtype=np.str_)
+            arrays[f"m{i}_article_idx"] = block.article_idx
+            arrays[f"m{i}_language_idx"] = block.language_idx
+            arrays[f"m{i}_probs"] = block.probs
+            arrays[f"m{i}_duplicate_of"] = block.duplicate_of
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load_npz(cls, path: str, models: Optional[Iterable[str]] = None) -> "ResultsStore":
+        """Reads a sidecar written by save_npz; arrays of models not listed are never loaded."""
+        with np.load(path) as data:
+            wanted = set(models) if models is not None else None
+            blocks = {}
+            for i, model in enumerate(data["models"].tolist()):
+                if wanted is not None and model not in wanted:
+                    continue
+                blocks[model] = ModelBlock(
+                    labels=data[f"m{i}_labels"].tolist(),
+                    article_idx=data[f"m{i}_article_idx"],
+                    language_idx=data[f"m{i}_language_idx"],
+                    probs=data[f"m{i}_probs"],
+                    duplicate_of=data[f"m{i}_duplicate_of"]
+                )
+            return cls(data["article_table"].tolist(), data["language_table"].tolist(), blocks)
+
+    def to_arrow(self):
+        """One Arrow table with a row per (model, article) and the scores as a list column."""
+        import pyarrow as pa
+
+        models, articles, languages, labels, scores, duplicates = [], [], [], [], [], []
+        for model, block in self.blocks.items():
+            n = len(block.article_idx)
+            models += [model] * n
+            articles += [self.article_table[i] for i in block.article_idx]
+            languages += [self.language_table[i] for i in block.language_idx]
+            labels += [block.labels] * n
+            scores += [row.tolist() for row in block.probs]
+            duplicates += [self.article_table[i] if i >= 0 else None for i in block.duplicate_of]
+
+        return pa.table({
+            "model": pa.array(models, pa.string()).dictionary_encode(),
+            "article_id": pa.array(articles, pa.string()),
+            "source_language": pa.array(languages, pa.string()).dictionary_encode(),
+            "labels": pa.array(labels, pa.list_(pa.string())),
+            "score": pa.array(scores, pa.list_(pa.float32())),
+            "duplicate_of": pa.array(duplicates, pa.string())
+        })
+
+    def to_parquet(self, path: str) -> None:
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path, compression="zstd")
+
+
+def as_results_store(results: Union[None, "ResultsStore", List["ModelResult"]]) -> ResultsStore:
+    """Accepts the results channel in either representation (store or legacy record list)."""
+    if isinstance(results, ResultsStore):
+        return results
+    return ResultsStore.from_records(results or [])
+
+
+def merge_results(left, right) -> ResultsStore:
+    """Reducer for GraphState.results."""
+    return as_results_store(left).merge(as_results_store(right))
@@ -0,0 +1,123 @@
+import io
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from graph.results_store import ResultsStore, as_results_store
+
+DEFAULT_OUTPUT_ROOT = "output/runs"
+
+_compress = False
+
+
+def configure_output(compress: bool = False) -> None:
+    """compress: write the NDJSON streams as .ndjson.zst (needs the 'zstandard' package)."""
+    global _compress
+    _compress = compress
+
+
+def run_output_dir(run_id: str, root: str = DEFAULT_OUTPUT_ROOT) -> str:
+    return os.path.join(root, run_id)
+
+
+def _open_text(path: str, mode: str, compressed: bool):
+    if compressed:
+        import zstandard
+
+        raw = open(path, mode + "b")
+        if mode == "w":
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_ndjson(path: str, records: Iterable[Dict]) -> int:
+    """Writes one JSON document per line as records are produced; returns the record count."""
+    count = 0
+    tmp_path = f"{path}.tmp"
+    with _open_text(tmp_path, "w", compressed=path.endswith(".zst")) as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def read_ndjson(path: str) -> Iterator[Dict]:
+    """Lazily yields the records of a (optionally .zst compressed) NDJSON file."""
+    with _open_text(path, "r", compressed=path.endswith(".zst")) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _article_records(state: Dict) -> Iterator[Dict]:
+    translations = {a["article_id"]: a.get("text_en", "") for a in state.get("translated_articles", [])}
+    duplicates = state.get("duplicates", {})
+    for article in state.get("raw_articles", []):
+        record = dict(article)
+        if article["article_id"] in translations:
+            record["text_en"] = translations[article["article_id"]]
+        if article["article_id"] in duplicates:
+            record["duplicate_of"] = duplicates[article["article_id"]]
+        yield record
+
+
+def save_run(state: Dict, run_id: str, root: str = DEFAULT_OUTPUT_ROOT) -> str:
+    """
+    Writes a run to <root>/<run_id>/:
+    - articles.ndjson[.zst]: one record per scraped article, with its English text
+    - results.ndjson[.zst]: one record per (article, model) result
+    - scores.npz: the score matrices as a binary columnar sidecar (ResultsStore.load_npz)
+    - manifest.json: run parameters, record counts and file names
+    Returns the directory.
+    """
+    directory = run_output_dir(run_id, root)
+    os.makedirs(directory, exist_ok=True)
+    suffix = ".ndjson.zst" if _compress else ".ndjson"
+    results: ResultsStore = as_results_store(state.get("results"))
+
+    files = {
+        "articles": f"articles{suffix}",
+        "results": f"results{suffix}",
+        "scores": "scores.npz"
+    }
+    counts = {
+        "articles": write_ndjson(os.path.join(directory, files["articles"]), _article_records(state)),
+        "results": write_ndjson(os.path.join(directory, files["results"]), results.iter_records())
+    }
+    results.save_npz(os.path.join(directory, files["scores"]))
+
+    manifest = {
+        "run_id": run_id,
+        "saved_at": datetime.now().isoformat(timespec="seconds"),
+        "input_text": state.get("input_text", []),
+        "selected_languages": state.get("selected_languages", []),
+        "num_articles": state.get("num_articles"),
+        "count_duplicates": state.get("count_duplicates", True),
+        "summary": state.get("summary", ""),
+        "models": list(results.blocks),
+        "counts": counts,
+        "files": files
+    }
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return directory
+
+
+def load_manifest(directory: str) -> Dict:
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_run_records(directory: str, kind: str) -> Iterator[Dict]:
+    """kind: 'articles' or 'results'."""
+    return read_ndjson(os.path.join(directory, load_manifest(directory)["files"][kind]))
+
+
+def load_run_scores(directory: str, models: Optional[List[str]] = None) -> ResultsStore:
+    return ResultsStore.load_npz(os.path.join(directory, load_manifest(directory)["files"]["scores"]), models)
@@ -0,0 +1,287 @@
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from graph.checkpointing import new_run_id, run_config
+from graph.graph_builder import ANALYZER_NODES, build_graph
+from graph.model_registry import registry
+from graph.nodes.display_results_node import results_html_path
+from graph.nodes.sentiment.encoder_inference import clear_tokenization_cache, configure_shared_batching
+from graph.run_output import run_output_dir
+from graph.state_definitions import new_run_state
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_JOBS = 2
+JOB_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+TRANSLATION_MODEL_PATH = "models/translation/m2m100_418M"
+
+
+@dataclass
+class Job:
+    job_id: str
+    topic: str
+    languages: List[str]
+    num_articles: int
+    count_duplicates: bool = True
+    status: str = "queued"  # queued -> running -> done | failed; queued jobs are cancelled on shutdown
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    run_id: Optional[str] = None
+    output_dir: Optional[str] = None
+    html_path: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        if self.started_at is not None:
+            data["seconds"] = round((self.finished_at or time.time()) - self.started_at, 2)
+        return data
+
+
+class ClsaService:
+    """
+    Runs CLSA jobs from a queue in one long-lived process. Models stay loaded in the
+    process-wide registry, compiled graphs are reused per language set, and up to
+    max_jobs jobs run at once with their encoder forward passes batched together.
+    """
+
+    def __init__(self, max_jobs: int = DEFAULT_MAX_JOBS, checkpointer=None):
+        self.max_jobs = max(1, max_jobs)
+        self.checkpointer = checkpointer
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._graphs: Dict[tuple, object] = {}
+        self._workers: List[threading.Thread] = []
+
+    def start(self) -> None:
+        configure_shared_batching(enabled=self.max_jobs > 1)
+        for i in range(self.max_jobs):
+            worker = threading.Thread(target=self._work, name=f"clsa-job-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self) -> None:
+        """Cancels queued jobs and waits for the running ones to finish."""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.status = "cancelled"
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers.clear()
+        configure_shared_batching(enabled=False)
+
+    def warm_up(self) -> None:
+        """Loads the translation model and every analyzer (and runs them once) before the first job."""
+        from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
+        from graph.translation_engine import get_translation_engine
+
+        print("\n🔥 Warming up models...")
+        start = time.perf_counter()
+        get_translation_engine(TRANSLATION_MODEL_PATH, M2M100ForConditionalGeneration, M2M100Tokenizer)
+        state = {"translated_articles": [{"article_id": "warm-up", "source_language": "en", "text_en": "Warm-up sentence."}]}
+        for _, node_fn in ANALYZER_NODES:
+            node_fn(state)
+        print(f"\n🔥 Models ready in {time.perf_counter() - start:.1f}s ({registry.total_bytes() / 1024 ** 2:.0f} MB)")
+
+    def submit(self, topic: str, languages: List[str], num_articles: int, count_duplicates: bool = True) -> Job:
+        job = Job(uuid.uuid4().hex[:12], topic, languages, num_articles, count_duplicates)
+        with self._lock:
+            self.jobs[job.job_id] = job
+        self._queue.put(job)
+        print(f"📥 Job {job.job_id} queued: '{topic}' ({', '.join(languages)}, {num_articles} articles/language)")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(self.jobs.values())
+
+    def stats(self) -> dict:
+        jobs = self.list()
+        return {
+            "status": "ok",
+            "max_jobs": self.max_jobs,
+            "jobs": {status: sum(job.status == status for job in jobs) for status in JOB_STATUSES},
+            "models_loaded": len(registry.loaded_models()),
+            "model_memory_mb": round(registry.total_bytes() / 1024 ** 2, 1)
+        }
+
+    def _graph(self, state: dict):
+        key = tuple(state["selected_languages"])
+        with self._lock:
+            if key not in self._graphs:
+                self._graphs[key] = build_graph(state, checkpointer=self.checkpointer)
+            return self._graphs[key]
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        job.status, job.started_at = "running", time.time()
+        job.run_id = f"{new_run_id(job.topic)}-{job.job_id}"
+        print(f"\n🚀 Job {job.job_id} started (run {job.run_id})")
+        try:
+            state = new_run_state(job.run_id, job.topic, job.languages, job.num_articles, job.count_duplicates)
+            # Jobs on the same topic must not overwrite each other's HTML view
+            state["html_dir"] = run_output_dir(job.run_id)
+            self._graph(state).invoke(state, run_config(job.run_id))
+            job.output_dir = state["html_dir"]
+            job.html_path = results_html_path(job.topic, job.output_dir)
+            job.status = "done"
+        except Exception as e:
+            job.status, job.error = "failed", f"{type(e).__name__}: {e}"
+        finally:
+            clear_tokenization_cache(job.run_id)
+        job.finished_at = time.time()
+        print(f"\n{'✅' if job.status == 'done' else '❌'} Job {job.job_id} {job.status} in {job.finished_at - job.started_at:.1f}s")
+
+
+def parse_job_request(payload: dict) -> dict:
+    """Validates a POST /jobs body: {"topic": str, "languages": [..] or "en,pl", "articles": int}."""
+    topic = payload.get("topic")
+    if not isinstance(topic, str) or not topic.strip():
+        raise ValueError("'topic' must be a non-empty string")
+
+    languages = payload.get("languages")
+    if isinstance(languages, str):
+        languages = languages.split(",")
+    if not isinstance(languages, list) or not all(isinstance(lang, str) for lang in languages):
+        raise ValueError("'languages' must be a list or a comma-separated string of language codes")
+    languages = [lang.strip() for lang in languages if lang.strip()]
+    if not languages:
+        raise ValueError("'languages' must not be empty")
+
+    num_articles = payload.get("articles", 3)
+    if not isinstance(num_articles, int) or num_articles < 1:
+        raise ValueError("'articles' must be a positive integer")
+
+    return {
+        "topic": topic.strip(),
+        "languages": languages,
+        "num_articles": num_articles,
+        "count_duplicates": not payload.get("exclude_duplicates", False)
+    }
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API:
+      POST /jobs          submit a job, returns its ID (202)
+      GET  /jobs          all jobs
+      GET  /jobs/<id>     job status, run ID and output paths
+      GET  /health        queue and model registry summary
+    """
+
+    server_version = "CLSA"
+
+    @property
+    def service(self) -> ClsaService:
+        return self.server.service
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        if path == "/health":
+            self._send(200, self.service.stats())
+        elif path == "/jobs":
+            self._send(200, {"jobs": [job.to_dict() for job in self.service.list()]})
+        elif path.startswith("/jobs/"):
+            job = self.service.get(path[len("/jobs/"):])
+            if job is None:
+                self._send(404, {"error": "unknown job"})
+            else:
+                self._send(200, job.to_dict())
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("request body must be a JSON object")
+            job = self.service.submit(**parse_job_request(payload))
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        self._send(202, job.to_dict())
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix-socket clients have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        print(f"   🛰 {self.address_string()} {format % args}")
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(
+    service: ClsaService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None,
+    warm_up: bool = True
+) -> None:
+    """Starts the job workers and serves the JSON API until interrupted."""
+    if warm_up:
+        service.warm_up()
+    service.start()
+
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, ServiceRequestHandler)
+        address = f"unix:{socket_path}"
+    else:
+        server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+        address = f"http://{host}:{server.server_address[1]}"
+    server.service = service
+
+    print(f"\n🛰 CLSA service listening on {address} ({service.max_jobs} concurrent jobs)")
+    print("   POST /jobs {\"topic\": ..., \"languages\": [...], \"articles\": N} · GET /jobs/<id> · GET /health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down...")
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+        service.stop()
@@ -1,31 +1,62 @@
-from typing import TypedDict, Annotated, Union, Dict
+from typing import TypedDict, Annotated, Union, Dict, NotRequired
 import operator
+from graph.results_store import ResultsStore, merge_results
+
+def make_article_id(language: str, index: int) -> str:
+    """
+    Article IDs are prefixed with the source language, so parallel scrape nodes
+    never hand out the same ID (e.g. 'pl-0003').
+    """
+    return f"{language}-{index:04d}"
+
+def merge_dicts(left: dict[str, str], right: dict[str, str]) -> dict[str, str]:
+    return {**left, **right}
 
 class InputText(TypedDict):
     language: str
     text: str
 
 class RawArticle(TypedDict):
-    article_id: int
+    article_id: str
     language: str
     text: str
 
 class TranslatedArticles(TypedDict):
-    article_id: int
+    article_id: str
     source_language: str
     text_en: str
 
 class ModelResult(TypedDict):
-    article_id: int
+    article_id: str
     source_language: str
     model: str
     score: Union[float, Dict[str, float]]
+    duplicate_of: NotRequired[str]
 
 class GraphState(TypedDict):
+    run_id: str
     selected_languages: list[str]
     num_articles: int
     input_text: list[InputText]
     raw_articles: Annotated[list[RawArticle], operator.add]
     translated_articles: Annotated[list[TranslatedArticles], operator.add]
-    results: Annotated[list[ModelResult], operator.add]
+    results: Annotated[ResultsStore, merge_results]
+    duplicates: Annotated[dict[str, str], merge_dicts]
+    count_duplicates: bool
     summary: str
+    html_dir: NotRequired[str]
+
+def new_run_state(run_id: str, topic: str, languages: list[str], num_articles: int, count_duplicates: bool = True) -> GraphState:
+    """Initial state of a run for an English topic."""
+    return {
+        "run_id": run_id,
+        "input_text": [{"language": "en", "text": topic}],
+        "selected_languages": languages,
+        "raw_articles": [],
+        "translated_articles": [],
+        "results": ResultsStore(),
+        "duplicates": {},
+        "count_duplicates": count_duplicates,
+        "summary": "",
+        "num_articles": num_articles
+    }
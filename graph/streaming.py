@@ -0,0 +1,177 @@
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from rich.live import Live
+from rich.text import Text
+
+from graph.aggregation import ResultsAggregator
+from graph.dedup import ArticleDeduplicator
+from graph.graph_builder import ANALYZER_NODES, AnalyzerSlots, analyzer_concurrency
+from graph.nodes.display_results_node import display_results_node, render_cli_table
+from graph.nodes.save_final_state_node import save_final_state_node
+from graph.nodes.scrape_node import scrape_node_factory
+from graph.nodes.translate_to_en_node import translate_to_en_node
+from graph.nodes.translate_to_multiple_node import translate_to_multiple_node
+from graph.results_store import ResultsStore, as_results_store
+from graph.state_definitions import GraphState, RawArticle, TranslatedArticles
+from graph.tracing import traced_node
+
+DEFAULT_SCRAPE_WORKERS = 4
+DEFAULT_TRANSLATE_BATCH = 8
+DEFAULT_QUEUE_SIZE = 64
+
+_DONE = object()
+
+
+def run_streaming(
+    initial_state: GraphState,
+    scrape_workers: int = DEFAULT_SCRAPE_WORKERS,
+    translate_batch_size: int = DEFAULT_TRANSLATE_BATCH,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    live: bool = True
+) -> GraphState:
+    """
+    Runs the pipeline with the same nodes as build_graph, but without barriers:
+    articles flow scrape -> translate -> analyze through bounded queues, so
+    translation and analysis start as soon as the first articles are scraped.
+
+    - scrape_workers: number of languages scraped at the same time
+    - translate_batch_size: maximum articles per translation micro-batch
+    - queue_size: capacity of every stage queue (back-pressure on earlier stages)
+    - live: redraw the per-language results table as analyzer results arrive
+    Analyzers run concurrently, capped as in the graph by analyzer_concurrency().
+    """
+    state: GraphState = dict(initial_state)
+    state.update(traced_node("translate_to_many", translate_to_multiple_node)(state))
+
+    raw_queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    analyzer_queues = {name: queue.Queue(maxsize=queue_size) for name, _ in ANALYZER_NODES}
+    limiter = AnalyzerSlots(analyzer_concurrency(len(ANALYZER_NODES)))
+
+    raw_articles: List[RawArticle] = list(state.get("raw_articles", []))
+    translated_articles: List[TranslatedArticles] = list(state.get("translated_articles", []))
+    duplicates = dict(state.get("duplicates", {}))
+    analyzer_results = {name: ResultsStore() for name, _ in ANALYZER_NODES}
+    errors: List[BaseException] = []
+
+    aggregator = ResultsAggregator(count_duplicates=state.get("count_duplicates", True))
+    aggregator.add_store(as_results_store(state.get("results")))
+    live_view = Live(Text(""), auto_refresh=False, transient=True) if live else None
+
+    def refresh_live_view():
+        if live_view is not None:
+            live_view.update(Text.from_ansi(render_cli_table(aggregator.table())), refresh=True)
+
+    def scrape_stage():
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, scrape_workers)) as pool:
+                futures = [
+                    pool.submit(traced_node(f"scrape_{lang}", scrape_node_factory(lang, on_article=raw_queue.put)), state)
+                    for lang in state["selected_languages"]
+                ]
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        errors.append(e)
+        finally:
+            raw_queue.put(_DONE)
+
+    def next_translation_batch() -> tuple[List[RawArticle], bool]:
+        batch = [raw_queue.get()]
+        while len(batch) < translate_batch_size and batch[-1] is not _DONE:
+            try:
+                batch.append(raw_queue.get_nowait())
+            except queue.Empty:
+                break
+        finished = batch[-1] is _DONE
+        return [a for a in batch if a is not _DONE], finished
+
+    def translate_stage():
+        # One raw and one English duplicate index per stream: every article is indexed once
+        translate = traced_node("translate_articles", functools.partial(translate_to_en_node, dedup=ArticleDeduplicator()))
+        failed = False
+        finished = False
+        try:
+            while not finished:
+                batch, finished = next_translation_batch()
+                if not batch or failed:
+                    continue
+                try:
+                    raw_articles.extend(batch)
+                    update = translate({"raw_articles": batch})
+                except Exception as e:
+                    # Keep draining so scrapers never block on a full queue
+                    errors.append(e)
+                    failed = True
+                    continue
+
+                new_articles = update.get("translated_articles", [])
+                batch_duplicates = update.get("duplicates", {})
+                translated_articles.extend(new_articles)
+                duplicates.update(batch_duplicates)
+                for analyzer_queue in analyzer_queues.values():
+                    analyzer_queue.put((new_articles, batch_duplicates))
+        finally:
+            for analyzer_queue in analyzer_queues.values():
+                analyzer_queue.put(_DONE)
+
+    def analyzer_stage(name: str, node_fn: Callable) -> None:
+        node_fn = traced_node(name, node_fn)
+        analyzer_queue = analyzer_queues[name]
+        failed = False
+        while True:
+            item = analyzer_queue.get()
+            if item is _DONE:
+                break
+            new_articles, batch_duplicates = item
+            if not new_articles or failed:
+                continue
+            try:
+                with limiter:
+                    update = node_fn({
+                        "translated_articles": new_articles,
+                        "results": analyzer_results[name],
+                        "duplicates": batch_duplicates
+                    })
+                new_results = as_results_store(update.get("results"))
+                analyzer_results[name] = analyzer_results[name].merge(new_results)
+                aggregator.add_store(new_results)
+                refresh_live_view()
+            except Exception as e:
+                errors.append(e)
+                failed = True
+
+    threads = [threading.Thread(target=scrape_stage), threading.Thread(target=translate_stage)]
+    threads += [threading.Thread(target=analyzer_stage, args=(name, fn)) for name, fn in ANALYZER_NODES]
+    if live_view is not None:
+        live_view.start()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        if live_view is not None:
+            live_view.stop()
+
+    if errors:
+        raise errors[0]
+
+    results = as_results_store(state.get("results"))
+    for name, _ in ANALYZER_NODES:
+        results = results.merge(analyzer_results[name])
+
+    final_state: GraphState = {
+        **state,
+        "raw_articles": raw_articles,
+        "translated_articles": translated_articles,
+        "results": results,
+        "duplicates": duplicates
+    }
+    save_final_state_node(final_state)
+    display_results_node(final_state, aggregator)
+    return final_state
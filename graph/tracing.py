@@ -0,0 +1,146 @@
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class Tracer:
+    """
+    Collects spans as Chrome trace events (chrome://tracing, Perfetto). A span records
+    its duration, the resident memory when it ends and any counters the caller sets
+    on it (tokens, batch size, bytes...). When disabled, spans cost one attribute check.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._start = time.perf_counter()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.events = []
+            self._start = time.perf_counter()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._start) * 1e6
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        event.setdefault("pid", os.getpid())
+        event.setdefault("tid", threading.get_ident())
+        with self._lock:
+            self.events.append(event)
+
+    def span(self, name: str, category: str = "clsa", concurrent: bool = False, **args) -> "Span":
+        """
+        Context manager timing a block. Use concurrent=True for spans that overlap on
+        one thread (asyncio tasks); they are exported as async begin/end pairs.
+        """
+        return Span(self, name, category, concurrent, args)
+
+    def export_chrome_trace(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Total time, count and summed counters per span name, slowest first."""
+        totals: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"count": 0, "seconds": 0.0})
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            if event["ph"] not in ("X", "e"):
+                continue
+            entry = totals[event["name"]]
+            entry["count"] += 1
+            entry["seconds"] += event.get("dur", event.get("args", {}).get("dur_us", 0)) / 1e6
+            for key in ("tokens", "articles", "bytes"):
+                if key in event.get("args", {}):
+                    entry[key] = entry.get(key, 0) + event["args"][key]
+        return sorted(({"name": name, **entry} for name, entry in totals.items()), key=lambda e: -e["seconds"])
+
+
+class Span:
+    __slots__ = ("tracer", "name", "category", "concurrent", "args", "_start", "_id")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, concurrent: bool, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.concurrent = concurrent
+        self.args = args
+
+    def set(self, **args) -> None:
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        if self.tracer.enabled:
+            self._start = self.tracer._now_us()
+            if self.concurrent:
+                self._id = next(self.tracer._ids)
+                self.tracer._emit({"name": self.name, "cat": self.category, "ph": "b", "id": self._id, "ts": self._start})
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self.tracer.enabled or not hasattr(self, "_start"):
+            return
+        end = self.tracer._now_us()
+        args = dict(self.args)
+        rss = _rss_mb()
+        if rss is not None:
+            args["rss_mb"] = rss
+        if exc_type is not None:
+            args["error"] = exc_type.__name__
+        if self.concurrent:
+            args["dur_us"] = end - self._start
+            self.tracer._emit({"name": self.name, "cat": self.category, "ph": "e", "id": self._id, "ts": end, "args": args})
+        else:
+            self.tracer._emit({"name": self.name, "cat": self.category, "ph": "X", "ts": self._start, "dur": end - self._start, "args": args})
+
+
+tracer = Tracer()
+
+
+def configure_tracing(enabled: bool = False) -> None:
+    tracer.enabled = enabled
+    tracer.reset()
+
+
+def span(name: str, category: str = "clsa", concurrent: bool = False, **args) -> Span:
+    return tracer.span(name, category, concurrent, **args)
+
+
+def traced_node(name: str, node_fn: Callable) -> Callable:
+    """Wraps a graph node so every call is recorded as a 'node' span."""
+    @functools.wraps(node_fn)
+    def node(state):
+        with span(name, "node"):
+            return node_fn(state)
+    return node
+
+
+def print_trace_summary(limit: int = 15) -> None:
+    rows = tracer.summary()[:limit]
+    if not rows:
+        return
+    print("\n⏱ Trace summary (total time per span):")
+    for row in rows:
+        extras = ", ".join(f"{key}={row[key]}" for key in ("tokens", "articles", "bytes") if key in row)
+        print(f"   {row['name']:<36} {row['seconds']:>9.3f}s  x{row['count']:<5} {extras}")
@@ -0,0 +1,166 @@
+from graph.tracing import span
+from graph.translation_cache import get_translation_cache
+from typing import Callable, List, Optional, Tuple
+
+DEFAULT_TOKEN_BUDGET = 4096
+
+# Decoding settings used for article sentences (see translate_to_en_node).
+GENERATION_KWARGS = {
+    "no_repeat_ngram_size": 3,
+    "repetition_penalty": 2.0,
+    "early_stopping": True
+}
+
+_token_budget = DEFAULT_TOKEN_BUDGET
+
+
+def configure_token_budget(token_budget: int) -> None:
+    """Sets the maximum number of (padded) source tokens per generate call."""
+    global _token_budget
+    _token_budget = max(1, int(token_budget))
+
+
+def length_bucketed_batches(lengths: List[int], token_budget: int) -> List[List[int]]:
+    """
+    Groups indices into batches of similar length. A batch is closed when
+    (longest sequence in batch) x (batch size) would exceed token_budget.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_max = 0
+
+    for i in order:
+        new_max = max(current_max, lengths[i])
+        if current and new_max * (len(current) + 1) > token_budget:
+            batches.append(current)
+            current, new_max = [], lengths[i]
+        current.append(i)
+        current_max = new_max
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def encode_source(tokenizer, text: str, src_lang: str, max_length: Optional[int] = None) -> List[int]:
+    """
+    M2M100 input ids of text: [source language token] + tokens + [eos]. Built per
+    call instead of setting tokenizer.src_lang, which is shared by every thread
+    that uses the loaded model (--serve, batch mode).
+    """
+    ids = tokenizer(
+        text, add_special_tokens=False, truncation=max_length is not None,
+        max_length=max_length - 2 if max_length is not None else None
+    )["input_ids"]
+    return [tokenizer.get_lang_id(src_lang)] + ids + [tokenizer.eos_token_id]
+
+
+def translate_sentences(
+    tokenizer,
+    engine,
+    sentences: List[str],
+    src_lang: str,
+    tgt_lang: str = "en",
+    token_budget: Optional[int] = None,
+    on_batch_done: Optional[Callable[[int], None]] = None
+) -> List[str]:
+    """
+    Translates sentences from src_lang to tgt_lang with length-bucketed batched
+    engine.generate calls (see graph.translation_engine). Sentences found in the translation cache are not sent to the
+    model. Returns translations in the order of `sentences`.
+    """
+    if not sentences:
+        return []
+
+    translations: List[str] = [""] * len(sentences)
+
+    cache = get_translation_cache()
+    model_id = engine.name_or_path
+    cache_params = {**GENERATION_KWARGS, "max_new_tokens": "min(128, 2 * source_length)", **engine.cache_params}
+    if cache is not None:
+        cached = cache.get_many(model_id, cache_params, src_lang, tgt_lang, sentences)
+        missing = []
+        for i, sentence in enumerate(sentences):
+            if sentence in cached:
+                translations[i] = cached[sentence]
+            else:
+                missing.append(i)
+        if on_batch_done and len(missing) < len(sentences):
+            on_batch_done(len(sentences) - len(missing))
+    else:
+        missing = list(range(len(sentences)))
+
+    if not missing:
+        return translations
+
+    with span("tokenize", "translation", src_lang=src_lang, sentences=len(missing)) as tokenize_span:
+        encoded = [encode_source(tokenizer, sentences[i], src_lang, tokenizer.model_max_length) for i in missing]
+        lengths = [len(ids) for ids in encoded]
+        tokenize_span.set(tokens=sum(lengths))
+    new_pairs = []
+
+    for batch in length_bucketed_batches(lengths, token_budget or _token_budget):
+        longest = max(lengths[i] for i in batch)
+
+        with span(
+            "generate", "translation", engine=engine.name, src_lang=src_lang, tgt_lang=tgt_lang, batch_size=len(batch),
+            tokens=sum(lengths[i] for i in batch), padded_tokens=longest * len(batch)
+        ) as generate_span:
+            generated = engine.generate(
+                [encoded[i] for i in batch],
+                [tgt_lang] * len(batch),
+                max_new_tokens=min(128, longest * 2),
+                **GENERATION_KWARGS
+            )
+            generate_span.set(new_tokens=sum(len(ids) for ids in generated))
+
+        decoded = tokenizer.batch_decode(generated, skip_special_tokens=True)
+        for i, text in zip(batch, decoded):
+            translations[missing[i]] = text
+            new_pairs.append((sentences[missing[i]], text))
+
+        if on_batch_done:
+            on_batch_done(len(batch))
+
+    if cache is not None:
+        cache.put_many(model_id, cache_params, src_lang, tgt_lang, new_pairs)
+
+    return translations
+
+
+def translate_rows(
+    tokenizer,
+    engine,
+    rows: List[Tuple[str, str]],
+    src_lang: str
+) -> List[str]:
+    """
+    Translates (text, tgt_lang) rows from src_lang in a single batched generate
+    call, with a per-row target language token. Returns translations in row order.
+    """
+    if not rows:
+        return []
+
+    encoded = {text: encode_source(tokenizer, text, src_lang) for text in dict.fromkeys(text for text, _ in rows)}
+    input_ids = [encoded[text] for text, _ in rows]
+
+    with span(
+        "generate", "translation", engine=engine.name, src_lang=src_lang, batch_size=len(rows),
+        tokens=sum(len(ids) for ids in input_ids)
+    ) as generate_span:
+        generated = engine.generate(input_ids, [lang for _, lang in rows])
+        generate_span.set(new_tokens=sum(len(ids) for ids in generated))
+
+    return tokenizer.batch_decode(generated, skip_special_tokens=True)
+
+
+def translate_to_many_languages(
+    tokenizer,
+    engine,
+    text: str,
+    src_lang: str,
+    tgt_langs: List[str]
+) -> List[str]:
+    """Translates one text into several target languages with a single batched generate call."""
+    return translate_rows(tokenizer, engine, [(text, lang) for lang in tgt_langs], src_lang)
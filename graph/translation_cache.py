@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CACHE_PATH = "cache/translation_memory.sqlite"
+DEFAULT_MAX_SIZE_MB = 256
+
+
+def normalize_sentence(sentence: str) -> str:
+    """NFC-normalizes and collapses whitespace so trivially different copies share an entry."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", sentence)).strip()
+
+
+class TranslationCache:
+    """
+    On-disk translation memory backed by SQLite. Entries are keyed by
+    (model id, decoding parameters, src_lang, tgt_lang, normalized sentence hash).
+    When the stored translations exceed max_size_mb, the least recently used
+    entries are deleted.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_size_mb: int = DEFAULT_MAX_SIZE_MB):
+        self.path = path
+        self.max_size_mb = max_size_mb
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY,"
+            " translation TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON translations(last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model_id: str, params: Dict, src_lang: str, tgt_lang: str, sentence: str) -> str:
+        params_key = json.dumps(params, sort_keys=True, default=str)
+        sentence_hash = hashlib.sha256(normalize_sentence(sentence).encode("utf-8")).hexdigest()
+        raw = "\x1f".join([model_id, params_key, src_lang, tgt_lang, sentence_hash])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_many(self, model_id: str, params: Dict, src_lang: str, tgt_lang: str, sentences: Iterable[str]) -> Dict[str, str]:
+        """Returns {sentence: translation} for the sentences found in the cache."""
+        sentences = list(sentences)
+        keys = {self.make_key(model_id, params, src_lang, tgt_lang, s): s for s in sentences}
+        found: Dict[str, str] = {}
+
+        with self._lock:
+            key_list = list(keys)
+            for start in range(0, len(key_list), 500):
+                part = key_list[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({','.join('?' * len(part))})",
+                    part
+                ).fetchall()
+                for key, translation in rows:
+                    found[keys[key]] = translation
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE translations SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in keys if keys[key] in found]
+                )
+                self._conn.commit()
+
+            hit_count = sum(1 for s in sentences if s in found)
+            self.hits += hit_count
+            self.misses += len(sentences) - hit_count
+
+        return found
+
+    def put_many(self, model_id: str, params: Dict, src_lang: str, tgt_lang: str, pairs: Iterable[Tuple[str, str]]) -> None:
+        now = time.time()
+        rows = [
+            (self.make_key(model_id, params, src_lang, tgt_lang, sentence), translation, len(translation.encode("utf-8")), now)
+            for sentence, translation in pairs
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, translation, size, last_used) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "size_bytes": size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        budget = self.max_size_mb * 1024 * 1024
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+        if total <= budget:
+            return
+
+        # Delete least recently used entries until we are 10% under the budget
+        target = int(budget * 0.9)
+        to_free = total - target
+        freed = 0
+        doomed: List[str] = []
+        for key, size in self._conn.execute("SELECT key, size FROM translations ORDER BY last_used ASC"):
+            if freed >= to_free:
+                break
+            doomed.append(key)
+            freed += size
+        self._conn.executemany("DELETE FROM translations WHERE key = ?", [(key,) for key in doomed])
+
+
+_cache: Optional[TranslationCache] = None
+_cache_enabled = True
+_cache_path = DEFAULT_CACHE_PATH
+_cache_max_size_mb = DEFAULT_MAX_SIZE_MB
+_cache_lock = threading.Lock()
+
+
+def configure_translation_cache(enabled: bool = True, path: str = DEFAULT_CACHE_PATH, max_size_mb: int = DEFAULT_MAX_SIZE_MB) -> None:
+    global _cache, _cache_enabled, _cache_path, _cache_max_size_mb
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+            _cache = None
+        _cache_enabled = enabled
+        _cache_path = path
+        _cache_max_size_mb = max_size_mb
+
+
+def get_translation_cache() -> Optional[TranslationCache]:
+    """Returns the process-wide translation cache, or None when caching is disabled."""
+    global _cache
+    with _cache_lock:
+        if not _cache_enabled:
+            return None
+        if _cache is None:
+            _cache = TranslationCache(_cache_path, _cache_max_size_mb)
+        return _cache
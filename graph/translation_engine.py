@@ -0,0 +1,216 @@
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from graph.model_registry import get_model, is_stale, registry
+
+ENGINES = ("hf", "ctranslate2")
+DEFAULT_CACHE_DIR = "cache/ctranslate2"
+
+_settings = {"engine": "hf", "cache_dir": DEFAULT_CACHE_DIR, "compute_type": "int8", "threads": None}
+_convert_lock = threading.Lock()
+
+
+def configure_translation_engine(
+    engine: str = "hf",
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    compute_type: str = "int8",
+    threads: Optional[int] = None
+) -> None:
+    """
+    engine: 'hf' (transformers generate, the default) or 'ctranslate2' (CPU, converted model).
+    compute_type: CTranslate2 weight type, e.g. 'int8' or 'float32'.
+    threads: CTranslate2 intra-op threads (default: torch's thread count).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown translation engine '{engine}', expected one of {ENGINES}")
+    _settings["engine"] = engine
+    _settings["cache_dir"] = cache_dir
+    _settings["compute_type"] = compute_type
+    _settings["threads"] = threads
+
+
+def _ctranslate2_selected() -> bool:
+    if _settings["engine"] != "ctranslate2":
+        return False
+    import torch
+
+    return not torch.cuda.is_available()
+
+
+def engine_cache_params() -> Dict[str, str]:
+    """Translation cache parameters of the selected engine; empty for the transformers path."""
+    if _ctranslate2_selected():
+        return {"engine": "ctranslate2", "compute_type": _settings["compute_type"]}
+    return {}
+
+
+class HFTranslationEngine:
+    """The transformers path: padded batches through model.generate on the model's device."""
+
+    name = "hf"
+    cache_params: Dict[str, str] = {}
+
+    def __init__(self, tokenizer: Any, model: Any, device: str):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.device = device
+        self.name_or_path = getattr(model, "name_or_path", type(model).__name__)
+
+    def generate(
+        self,
+        input_ids: List[List[int]],
+        tgt_langs: List[str],
+        max_new_tokens: Optional[int] = None,
+        **generation_kwargs
+    ) -> List[List[int]]:
+        """Generates one token id sequence per source row, row i translated into tgt_langs[i]."""
+        import torch
+
+        inputs = self.tokenizer.pad(
+            {"input_ids": input_ids, "attention_mask": [[1] * len(ids) for ids in input_ids]},
+            padding="longest",
+            return_tensors="pt"
+        ).to(self.device)
+
+        if len(set(tgt_langs)) == 1:
+            generation_kwargs["forced_bos_token_id"] = self.tokenizer.get_lang_id(tgt_langs[0])
+        else:
+            # Per-row target language: start every decoder row with [decoder_start, <tgt_lang>]
+            decoder_start = self.model.config.decoder_start_token_id
+            generation_kwargs["decoder_input_ids"] = torch.tensor(
+                [[decoder_start, self.tokenizer.get_lang_id(lang)] for lang in tgt_langs], device=self.device
+            )
+        if max_new_tokens is not None:
+            generation_kwargs["max_new_tokens"] = max_new_tokens
+
+        with torch.inference_mode():
+            generated = self.model.generate(**inputs, **generation_kwargs)
+        return generated.tolist()
+
+
+class CTranslate2Engine:
+    """
+    M2M100 converted to CTranslate2: int8 weights by default and an incremental
+    decoder with a KV cache, on CPU. Decoding settings follow the model's
+    generation_config (beams, max_length) like transformers generate does.
+    """
+
+    name = "ctranslate2"
+
+    def __init__(self, tokenizer: Any, path: str, name_or_path: str, compute_type: str, threads: Optional[int] = None):
+        import ctranslate2
+        import torch
+        from transformers import GenerationConfig
+
+        self.tokenizer = tokenizer
+        self.name_or_path = name_or_path
+        self.path = path
+        self.cache_params = {"engine": self.name, "compute_type": compute_type}
+        self.translator = ctranslate2.Translator(
+            path, device="cpu", compute_type=compute_type, inter_threads=1,
+            intra_threads=threads or torch.get_num_threads()
+        )
+        try:
+            generation_config = GenerationConfig.from_pretrained(name_or_path)
+        except OSError:
+            generation_config = GenerationConfig()
+        self.beam_size = generation_config.num_beams or 1
+        self.max_length = generation_config.max_length or 200
+
+    def generate(
+        self,
+        input_ids: List[List[int]],
+        tgt_langs: List[str],
+        max_new_tokens: Optional[int] = None,
+        no_repeat_ngram_size: int = 0,
+        repetition_penalty: float = 1.0,
+        num_beams: Optional[int] = None,
+        **_unused
+    ) -> List[List[int]]:
+        """Same contract as HFTranslationEngine.generate; the returned ids start with the target language token."""
+        source = [self.tokenizer.convert_ids_to_tokens(ids) for ids in input_ids]
+        prefix = [[self.tokenizer.lang_code_to_token[lang]] for lang in tgt_langs]
+        # As in generate, the forced language token counts as a new token and max_length includes decoder_start
+        max_length = max_new_tokens if max_new_tokens is not None else self.max_length - 1
+        results = self.translator.translate_batch(
+            source,
+            target_prefix=prefix,
+            beam_size=num_beams or self.beam_size,
+            max_decoding_length=max_length,
+            repetition_penalty=repetition_penalty,
+            no_repeat_ngram_size=no_repeat_ngram_size,
+            max_batch_size=len(source)
+        )
+        return [self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]) for result in results]
+
+
+def ctranslate2_model_dir(model_path: str, compute_type: str) -> str:
+    """Converted models live next to local models (<model>/ctranslate2-<type>/), Hub models under cache/ctranslate2."""
+    name = f"ctranslate2-{compute_type}"
+    if os.path.isdir(model_path):
+        return os.path.join(model_path, name)
+    return os.path.join(_settings["cache_dir"], model_path.replace("/", "--"), name)
+
+
+def _register_m2m100_loader() -> None:
+    """
+    CTranslate2 builds the M2M100 vocabulary from tokenizer.get_vocab(), which no longer
+    lists the language tokens in recent transformers. Build it from the ids instead.
+    """
+    from ctranslate2.converters import transformers as ct2_transformers
+
+    class M2M100Loader(ct2_transformers.M2M100Loader):
+        def get_vocabulary(self, model, tokenizer):
+            first_madeup = max(tokenizer.lang_code_to_id.values()) + 1
+            tokens = tokenizer.convert_ids_to_tokens(list(range(first_madeup)))
+            return tokens + [f"madeupword{i}" for i in range(model.config.vocab_size - first_madeup)]
+
+    ct2_transformers.register_loader("M2M100Config")(M2M100Loader)
+
+
+def convert_to_ctranslate2(model_path: str, output_dir: str, compute_type: str) -> None:
+    import ctranslate2
+
+    _register_m2m100_loader()
+    tmp_dir = f"{output_dir}.{threading.get_ident()}.tmp"
+    try:
+        ctranslate2.converters.TransformersConverter(model_path).convert(
+            tmp_dir, quantization=compute_type, force=True
+        )
+        if os.path.isdir(output_dir):
+            shutil.rmtree(output_dir)
+        os.replace(tmp_dir, output_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _load_ctranslate2(model_path: str, tokenizer_cls: Any) -> Tuple[Any, Any, int]:
+    compute_type = _settings["compute_type"]
+    output_dir = ctranslate2_model_dir(model_path, compute_type)
+    with _convert_lock:
+        if is_stale(os.path.join(output_dir, "model.bin"), model_path):
+            print(f"   🔁 Converting '{model_path}' to CTranslate2 ({compute_type})")
+            os.makedirs(os.path.dirname(output_dir) or ".", exist_ok=True)
+            convert_to_ctranslate2(model_path, output_dir, compute_type)
+
+    tokenizer = tokenizer_cls.from_pretrained(model_path)
+    engine = CTranslate2Engine(tokenizer, output_dir, model_path, compute_type, _settings["threads"])
+    return tokenizer, engine, os.path.getsize(os.path.join(output_dir, "model.bin"))
+
+
+def get_translation_engine(model_path: str, model_cls: Any, tokenizer_cls: Any) -> Tuple[Any, Any]:
+    """
+    Returns (tokenizer, engine) for the translation model. The CTranslate2 engine is
+    used on CPU when selected; the model is converted on first use and cached in the
+    model registry like any other model.
+    """
+    if _ctranslate2_selected():
+        key = (model_path, "cpu", f"ctranslate2-{_settings['compute_type']}")
+        return registry.get_or_load(
+            key, lambda: _load_ctranslate2(model_path, tokenizer_cls), backend="ctranslate2"
+        )
+
+    tokenizer, model, device = get_model(model_path, model_cls, tokenizer_cls)
+    return tokenizer, HFTranslationEngine(tokenizer, model, device)
@@ -1,7 +1,26 @@
 import argparse
 import sys
 import time
+from graph.checkpointing import load_run_state, new_run_id, open_checkpointer, run_config
 from graph.graph_builder import build_graph
+from graph.run_output import configure_output
+from graph.batch import load_topics, run_batch
+from graph.service import DEFAULT_HOST, DEFAULT_MAX_JOBS, DEFAULT_PORT, ClsaService, serve
+from graph.state_definitions import new_run_state
+from graph.tracing import configure_tracing, print_trace_summary, tracer
+from graph.streaming import DEFAULT_SCRAPE_WORKERS, DEFAULT_TRANSLATE_BATCH, run_streaming
+from graph.model_registry import configure_registry
+from graph.quantization import configure_quantization
+from graph.onnx_backend import BACKENDS, configure_backend
+from graph.translation import DEFAULT_TOKEN_BUDGET, configure_token_budget
+from graph.translation_engine import ENGINES, configure_translation_engine
+from graph.http_cache import DEFAULT_TTL_SECONDS, configure_http_cache
+from graph.translation_cache import DEFAULT_MAX_SIZE_MB, configure_translation_cache
+from graph.nodes.sentiment.encoder_inference import (
+    DEFAULT_BATCH_SIZE,
+    clear_tokenization_cache,
+    configure_batch_size
+)
 
 def main():
     try:
@@ -15,12 +34,10 @@ def main():
     )
     parser.add_argument(
         "--text", "-t",
-        required=True,
         help="Input text for translation and sentiment analysis."
     )
     parser.add_argument(
         "--langs", "-l",
-        required=True,
         help="Comma-separated list of target languages, e.g., en,pl,de,fr"
     )
     parser.add_argument(
@@ -29,42 +46,267 @@ def main():
         default=3,
         help="Number of articles to scrape per language (default: 3)."
     )
+    parser.add_argument(
+        "--model-memory", "-m",
+        type=int,
+        default=None,
+        help="Memory budget in MB for cached models; least recently used models are evicted. Also caps how many analyzers run at once (about 1 GB each; default: unlimited, concurrency from available memory)."
+    )
+    parser.add_argument(
+        "--batch-size", "-b",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Number of text chunks per encoder forward pass (default: {DEFAULT_BATCH_SIZE})."
+    )
+    parser.add_argument(
+        "--translation-tokens",
+        type=int,
+        default=DEFAULT_TOKEN_BUDGET,
+        help=f"Maximum padded source tokens per translation batch (default: {DEFAULT_TOKEN_BUDGET})."
+    )
+    parser.add_argument(
+        "--translation-cache-mb",
+        type=int,
+        default=DEFAULT_MAX_SIZE_MB,
+        help=f"Size limit in MB of the on-disk translation memory (default: {DEFAULT_MAX_SIZE_MB})."
+    )
+    parser.add_argument(
+        "--no-translation-cache",
+        action="store_true",
+        help="Disable the on-disk translation memory."
+    )
+    parser.add_argument(
+        "--http-cache-ttl",
+        type=float,
+        default=DEFAULT_TTL_SECONDS / 3600,
+        help=f"Hours before cached search pages and articles are revalidated (default: {DEFAULT_TTL_SECONDS / 3600:g})."
+    )
+    parser.add_argument(
+        "--no-http-cache",
+        action="store_true",
+        help="Disable the on-disk HTTP response cache."
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve search pages and articles only from the HTTP cache, without network access."
+    )
+    parser.add_argument(
+        "--exclude-duplicates",
+        action="store_true",
+        help="Leave near-duplicate articles (e.g. syndicated wire copies) out of the per-language results table."
+    )
+    parser.add_argument(
+        "--resume", "-r",
+        metavar="RUN_ID",
+        help="Resume an interrupted run from its last checkpoint; topic, languages and article count are taken from the run."
+    )
+    parser.add_argument(
+        "--streaming", "-s",
+        action="store_true",
+        help="Stream articles through scrape, translate and analyze stages instead of running them one after another."
+    )
+    parser.add_argument(
+        "--scrape-workers",
+        type=int,
+        default=DEFAULT_SCRAPE_WORKERS,
+        help=f"Streaming and batch modes: number of searches (languages, or topic/language pairs) scraped at the same time (default: {DEFAULT_SCRAPE_WORKERS})."
+    )
+    parser.add_argument(
+        "--translate-batch",
+        type=int,
+        default=DEFAULT_TRANSLATE_BATCH,
+        help=f"Streaming mode: maximum articles per translation micro-batch (default: {DEFAULT_TRANSLATE_BATCH})."
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Write the run's NDJSON article and result streams zstd-compressed (requires 'zstandard')."
+    )
+    parser.add_argument(
+        "--quantize", "-q",
+        action="store_true",
+        help="Run the encoder analyzers with dynamic int8 quantization when on CPU (cached in cache/quantized)."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="torch",
+        help="Inference backend of the encoder analyzers on CPU; 'onnx' exports them once to ONNX and runs them on ONNX Runtime (default: torch)."
+    )
+    parser.add_argument(
+        "--translation-engine",
+        choices=ENGINES,
+        default="hf",
+        help="M2M100 decoding engine on CPU; 'ctranslate2' converts the model once to an int8 CTranslate2 model (default: hf)."
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="Record per-node and per-step timings (model load, tokenization, generate, forward, fetch, parse) and write a Chrome trace JSON to PATH."
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a long-lived local service: models stay loaded and topics are submitted as jobs over a JSON API."
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Service mode: address to listen on (default: {DEFAULT_HOST})."
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Service mode: TCP port (default: {DEFAULT_PORT})."
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Service mode: listen on a Unix socket at PATH instead of TCP."
+    )
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=DEFAULT_MAX_JOBS,
+        help=f"Service mode: jobs run at once; their encoder batches are shared (default: {DEFAULT_MAX_JOBS})."
+    )
+    parser.add_argument(
+        "--topics",
+        metavar="FILE",
+        help="Batch mode: run every topic in FILE (one per line, plain text or JSON with 'topic', 'languages', 'articles') sharing model loads, scraping and inference; --langs and --articles are the defaults."
+    )
     args = parser.parse_args()
+    if args.serve and (args.resume or args.streaming or args.trace):
+        parser.error("--resume, --streaming and --trace are not supported with --serve")
+    if args.topics and (args.resume or args.streaming or args.serve or args.text):
+        parser.error("--text, --resume, --streaming and --serve are not supported with --topics")
+    if not args.serve and not args.topics and not args.resume and (not args.text or not args.langs):
+        parser.error("--text and --langs are required unless --resume, --serve or --topics is given")
+    if args.resume and args.streaming:
+        parser.error("--resume is not supported in --streaming mode")
 
-    selected_languages = [lang.strip() for lang in args.langs.split(",") if lang.strip()]
-    if not selected_languages:
-        print("❗ No languages provided. Example usage: --langs en,pl,de")
-        sys.exit(1)
+    if args.compress:
+        try:
+            import zstandard
+        except ImportError:
+            print("❗ The 'zstandard' library is not installed. Please run: pip install zstandard")
+            sys.exit(1)
+
+    if args.backend == "onnx":
+        try:
+            import onnxruntime
+        except ImportError:
+            print("❗ The 'onnxruntime' library is not installed. Please run: pip install onnxruntime onnx onnxscript")
+            sys.exit(1)
+
+    if args.translation_engine == "ctranslate2":
+        try:
+            import ctranslate2
+        except ImportError:
+            print("❗ The 'ctranslate2' library is not installed. Please run: pip install ctranslate2")
+            sys.exit(1)
+
+    configure_registry(max_memory_mb=args.model_memory)
+    configure_batch_size(args.batch_size)
+    configure_quantization(enabled=args.quantize)
+    configure_backend(args.backend)
+    configure_token_budget(args.translation_tokens)
+    configure_translation_engine(args.translation_engine)
+    configure_http_cache(enabled=not args.no_http_cache, ttl_seconds=args.http_cache_ttl * 3600, offline=args.offline)
+    configure_translation_cache(enabled=not args.no_translation_cache, max_size_mb=args.translation_cache_mb)
+    configure_output(compress=args.compress)
+    configure_tracing(enabled=bool(args.trace))
+
+    if args.topics:
+        default_languages = [lang.strip() for lang in (args.langs or "").split(",") if lang.strip()]
+        try:
+            topics = load_topics(args.topics, default_languages, args.articles)
+        except (OSError, ValueError) as e:
+            print(f"❗ Could not read topics: {e}")
+            sys.exit(1)
+        if not topics:
+            print(f"❗ No topics found in '{args.topics}'.")
+            sys.exit(1)
 
-    initial_state = {
-        "input_text": [
-            {
-                "language": "en",
-                "text": args.text
-            }
-        ],
-        "selected_languages": selected_languages,
-        "translated_texts": [],
-        "raw_articles": [],
-        "translated_to_english": [],
-        "results": [],
-        "summary": "",
-        "num_articles": args.articles
-    }
-
-    graph = build_graph(initial_state)
+        print("=" * 70)
+        print("🚀 Starting Cross-Lingual Sentiment Analyzer (LangGraph + rich) — batch mode")
+        for t in topics:
+            print(f"📝 {t['topic']} — {', '.join(t['languages'])}, {t['num_articles']} articles/language")
+        print("=" * 70)
 
+        clear_tokenization_cache()
+        start_time = time.time()
+        states = run_batch(topics, scrape_workers=args.scrape_workers, count_duplicates=not args.exclude_duplicates)
+        elapsed = time.time() - start_time
+
+        if args.trace:
+            tracer.export_chrome_trace(args.trace)
+            print_trace_summary()
+            print(f"\n🧭 Trace written to {args.trace} (open in chrome://tracing or ui.perfetto.dev)")
+
+        print("\n" + "=" * 70)
+        print(f"✅ {len(states)} topics done in {elapsed:.2f}s")
+        for state in states:
+            print(f"   🔖 {state['run_id']}: {len(state['translated_articles'])} articles")
+        print("=" * 70)
+        return
+
+    checkpointer = open_checkpointer()
+
+    if args.serve:
+        serve(ClsaService(max_jobs=args.max_jobs, checkpointer=checkpointer), args.host, args.port, args.socket)
+        return
+
+    if args.resume:
+        run_id = args.resume
+        initial_state = load_run_state(checkpointer, run_id)
+        if initial_state is None:
+            print(f"❗ No checkpoint found for run '{run_id}'.")
+            sys.exit(1)
+        initial_state.setdefault("run_id", run_id)
+        graph_input = None
+    else:
+        selected_languages = [lang.strip() for lang in args.langs.split(",") if lang.strip()]
+        if not selected_languages:
+            print("❗ No languages provided. Example usage: --langs en,pl,de")
+            sys.exit(1)
+
+        run_id = new_run_id(args.text)
+        initial_state = new_run_state(
+            run_id, args.text, selected_languages, args.articles, count_duplicates=not args.exclude_duplicates
+        )
+        graph_input = initial_state
+
+    topic = next((t["text"] for t in initial_state["input_text"] if t["language"] == "en"), "")
     print("=" * 70)
     print("🚀 Starting Cross-Lingual Sentiment Analyzer (LangGraph + rich)")
-    print(f"📝 Input text: {args.text}")
-    print(f"🌎 Languages: {', '.join(selected_languages)}")
-    print(f"📰 Articles per language: {args.articles}")
+    print(f"📝 Input text: {topic}")
+    print(f"🌎 Languages: {', '.join(initial_state['selected_languages'])}")
+    print(f"📰 Articles per language: {initial_state['num_articles']}")
+    if not args.streaming:
+        print(f"🔖 Run ID: {run_id}{' (resumed)' if args.resume else ''} — resume with: --resume {run_id}")
     print("=" * 70)
 
+    clear_tokenization_cache()
     start_time = time.time()
-    final_state = graph.invoke(initial_state)
+    if args.streaming:
+        final_state = run_streaming(
+            initial_state,
+            scrape_workers=args.scrape_workers,
+            translate_batch_size=args.translate_batch
+        )
+    else:
+        graph = build_graph(initial_state, checkpointer=checkpointer)
+        final_state = graph.invoke(graph_input, run_config(run_id))
     elapsed = time.time() - start_time
 
+    if args.trace:
+        tracer.export_chrome_trace(args.trace)
+        print_trace_summary()
+        print(f"\n🧭 Trace written to {args.trace} (open in chrome://tracing or ui.perfetto.dev)")
+
     print("\n" + "=" * 70)
     print(f"✅ Done in {elapsed:.2f}s")
     print("=" * 70)
@@ -0,0 +1,175 @@
+"""
+Compares the lxml article extractor with the previous BeautifulSoup extractor
+on a fixed corpus of pages.
+
+By default the corpus is generated from a fixed seed: news-like pages in English,
+German, Polish and Russian with the usual markup around the article (head scripts
+and styles, navigation, asides, forms, noscript blocks, footers, inline links and
+entities), so the numbers are reproducible. --pages runs on saved pages instead.
+
+Usage:
+    python scripts/benchmark_extraction.py                        # 200 generated pages, seed 0
+    python scripts/benchmark_extraction.py --count 500 --seed 1
+    python scripts/benchmark_extraction.py --pages cache/http     # pages saved by the HTTP cache
+"""
+import argparse
+import glob
+import gzip
+import html
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from graph.extraction import extract_article_text
+
+
+def extract_article_text_bs4(html_text: str) -> str:
+    """The extractor previously used by scrape_node (html.parser + decompose + find_all)."""
+    page_soup = BeautifulSoup(html_text, "html.parser")
+
+    for tag in page_soup(["script", "style", "noscript", "header", "footer", "aside", "form", "nav"]):
+        tag.decompose()
+
+    paragraphs = [p.get_text(" ", strip=True) for p in page_soup.find_all("p")]
+    return "\n".join(p for p in paragraphs if len(p) > 50)
+
+
+WORDS = {
+    "en": "the government agreement climate talks minister said on Thursday new report market prices energy "
+          "city council election vote police investigation court ruling company workers strike union "
+          "according to officials people country week year after before during against between".split(),
+    "de": "die Regierung hat am Donnerstag das neue Gesetz vorgestellt Verhandlungen über Klima Energie "
+          "Preise Stadt Wahl Polizei Gericht Unternehmen Mitarbeiter nach Angaben der Behörden Woche Jahr "
+          "gegen zwischen während für Menschen Land Bericht Markt".split(),
+    "pl": "rząd przedstawił w czwartek nową ustawę rozmowy o klimacie energii ceny miasto wybory policja "
+          "sąd spółka pracownicy strajk według urzędników ludzie kraj tydzień rok przed po podczas "
+          "między raport rynek".split(),
+    "ru": "правительство в четверг представило новый закон переговоры о климате энергии цены город выборы "
+          "полиция суд компания работники забастовка по словам чиновников люди страна неделя год после "
+          "до во время между доклад рынок".split()
+}
+
+
+def _sentence(rng: random.Random, words: list[str]) -> str:
+    text = " ".join(rng.choice(words) for _ in range(rng.randint(6, 18)))
+    return text[0].upper() + text[1:] + rng.choice([".", ".", ".", "?", "!"])
+
+
+def _paragraph(rng: random.Random, words: list[str]) -> str:
+    """Article paragraph with the inline markup of real pages: links, emphasis, entities, comments."""
+    parts = []
+    for _ in range(rng.randint(1, 5)):
+        sentence = html.escape(_sentence(rng, words))
+        roll = rng.random()
+        if roll < 0.2:
+            words_in = sentence.split(" ")
+            i = rng.randrange(len(words_in))
+            words_in[i] = f'<a href="/topic/{rng.randint(1, 9999)}" class="inline-link">{words_in[i]}</a>'
+            sentence = " ".join(words_in)
+        elif roll < 0.3:
+            sentence = f"<strong>{sentence}</strong>"
+        elif roll < 0.4:
+            sentence = f"{sentence} <em>&laquo;{html.escape(rng.choice(words))}&raquo;</em> &amp; {html.escape(rng.choice(words))}"
+        elif roll < 0.45:
+            sentence = f"{sentence}<!-- tracking:{rng.randint(1, 10 ** 6)} --><br>"
+        parts.append(sentence)
+    separator = rng.choice([" ", "\n      ", " &nbsp;"])
+    return separator.join(parts)
+
+
+def generate_page(rng: random.Random) -> str:
+    language = rng.choice(list(WORDS))
+    words = WORDS[language]
+    css = "".join(f".c{i}{{margin:{i % 7}px;color:#{rng.randrange(16 ** 6):06x}}}" for i in range(rng.randint(200, 1500)))
+    js = "".join(f"window.t{i}=function(a){{return a+'<p>'+{i}}};" for i in range(rng.randint(100, 800)))
+    menu = "".join(f'<li><a href="/section/{i}">{html.escape(rng.choice(words))}</a></li>' for i in range(rng.randint(10, 60)))
+    boilerplate_p = lambda: f"<p>{html.escape(_sentence(rng, words))} {html.escape(_sentence(rng, words))}</p>"
+
+    body = []
+    for i in range(rng.randint(8, 60)):
+        roll = rng.random()
+        if roll < 0.08:
+            body.append(f"<aside class=\"related\">{boilerplate_p()}</aside>")
+        elif roll < 0.12:
+            body.append(f"<div class=\"ad\"><noscript>{boilerplate_p()}</noscript></div>")
+        elif roll < 0.16:
+            body.append(f'<figure><img src="/img/{i}.jpg" alt=""><figcaption><p>{html.escape(_sentence(rng, words))}</p></figcaption></figure>')
+        elif roll < 0.22:
+            body.append(f"<p class=\"short\">{html.escape(rng.choice(words))}</p>")
+        elif roll < 0.3:
+            body.append(f'<div class="block"><div class="inner"><p>{_paragraph(rng, words)}</p></div></div>')
+        else:
+            body.append(f"<p>{_paragraph(rng, words)}</p>")
+
+    return (
+        f'<!DOCTYPE html><html lang="{language}"><head><meta charset="utf-8">'
+        f"<title>{html.escape(_sentence(rng, words))}</title><style>{css}</style><script>{js}</script>"
+        f'<script type="application/ld+json">{{"@type": "NewsArticle", "headline": "{rng.choice(words)}"}}</script></head>'
+        f'<body><header><nav><ul>{menu}</ul>{boilerplate_p()}</nav></header>'
+        f'<div class="layout"><main><article><h1>{html.escape(_sentence(rng, words))}</h1>'
+        f'<div class="byline"><p>{html.escape(rng.choice(words))}</p></div>{"".join(body)}'
+        f'<form action="/comments"><p>{html.escape(_sentence(rng, words))} {html.escape(_sentence(rng, words))}</p></form>'
+        f'</article></main></div><footer>{boilerplate_p()}</footer><script>{js[:2000]}</script></body></html>'
+    )
+
+
+def generate_pages(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [generate_page(rng) for _ in range(count)]
+
+
+def load_pages(directory: str) -> list[str]:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "**", "*.htm*"), recursive=True)):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    for path in sorted(glob.glob(os.path.join(directory, "**", "*.json.gz"), recursive=True)):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            pages.append(json.load(f)["body"])
+    return pages
+
+
+def time_extractor(extractor, pages: list[str], repeat: int) -> tuple[float, list[str]]:
+    outputs = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        outputs = [extractor(page) for page in pages]
+    return (time.perf_counter() - start) / repeat, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark article text extractors on a fixed corpus of pages.")
+    parser.add_argument("--pages", "-p", help="Directory with saved .html pages or HTTP cache entries (default: the generated corpus).")
+    parser.add_argument("--count", "-n", type=int, default=200, help="Generated pages (default: 200).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated corpus (default: 0).")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Number of passes over the corpus (default: 3).")
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages)
+        if not pages:
+            print(f"❗ No pages found in '{args.pages}'.")
+            sys.exit(1)
+    else:
+        pages = generate_pages(args.count, args.seed)
+
+    total_mb = sum(len(p.encode("utf-8")) for p in pages) / (1024 * 1024)
+    print(f"📄 Corpus: {len(pages)} pages, {total_mb:.1f} MB")
+
+    bs4_time, bs4_out = time_extractor(extract_article_text_bs4, pages, args.repeat)
+    lxml_time, lxml_out = time_extractor(extract_article_text, pages, args.repeat)
+
+    identical = sum(1 for a, b in zip(bs4_out, lxml_out) if a == b)
+    print(f"   BeautifulSoup: {bs4_time:.3f}s per pass")
+    print(f"   lxml:          {lxml_time:.3f}s per pass")
+    print(f"   Speedup:       {bs4_time / lxml_time:.1f}x")
+    print(f"   Identical output on {identical}/{len(pages)} pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""
+End-to-end benchmark of the graph on synthetic multilingual articles, fully offline on CPU.
+
+A local HTTP server stands in for the search engine and the news sites, and tiny randomly
+initialized M2M100 / RoBERTa models are written under the relative model paths the nodes
+load from. Every node is timed on its own, then the whole compiled graph (build_graph).
+For each step the benchmark reports articles/s, tokens/s and peak RSS, and writes them as JSON.
+
+Usage:
+    python scripts/benchmark_pipeline.py --output bench.json
+    python scripts/benchmark_pipeline.py --languages de,pl,en --articles 16 --repeat 3 --output bench.json
+    python scripts/benchmark_pipeline.py --compare bench.json --tolerance 0.25   # exit 1 on regressions
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Never reach the Hugging Face Hub: every model path resolves to a local directory
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+ANALYZER_LABELS = {
+    "models/encoders/twitter-roberta-base-sentiment-latest": 3,
+    "unitary/toxic-bert": 6,
+    "j-hartmann/emotion-english-distilroberta-base": 7,
+    "cardiffnlp/twitter-roberta-base-irony": 2,
+    "cointegrated/roberta-base-formality": 2,
+    "GroNLP/mdebertav3-subjectivity-english": 2,
+    "IDA-SERICS/PropagandaDetection": 2
+}
+TRANSLATION_MODEL_PATH = "models/translation/m2m100_418M"
+TOPIC = "International climate agreement negotiations"
+
+
+# --- Synthetic corpus ---
+
+_ALPHABETS = {
+    "en": "abcdefghijklmnoprstuw", "de": "abdeghiklmnorstuwzäöü", "pl": "abcdeghijklmnoprstwyząęóśł",
+    "fr": "abcdefgilmnoprstuvéèà", "es": "abcdefgilmnoprstuvñáé", "ru": "абвгдежзиклмнопрстуя",
+    "uk": "абвгдежзиклмнопрстуяії", "tr": "abcdefghiklmnoprstuüşç"
+}
+
+
+def make_vocabulary(language: str, rng: random.Random, size: int = 400) -> List[str]:
+    alphabet = _ALPHABETS.get(language, _ALPHABETS["en"])
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(2, 9))) for _ in range(size)]
+
+
+def make_article(vocabulary: List[str], rng: random.Random) -> List[str]:
+    """Paragraphs of random sentences; every paragraph is long enough for extract_article_text."""
+    paragraphs = []
+    for _ in range(rng.randint(3, 6)):
+        sentences = []
+        for _ in range(rng.randint(2, 5)):
+            words = [rng.choice(vocabulary) for _ in range(rng.randint(6, 18))]
+            sentences.append(" ".join(words).capitalize() + ".")
+        paragraphs.append(" ".join(sentences))
+    return paragraphs
+
+
+def build_corpus(languages: List[str], articles: int, seed: int) -> Dict[str, List[List[str]]]:
+    rng = random.Random(seed)
+    corpus = {}
+    for language in languages:
+        vocabulary = make_vocabulary(language, rng)
+        corpus[language] = [make_article(vocabulary, rng) for _ in range(articles)]
+    return corpus
+
+
+# --- Local stand-in for the search engine and news sites ---
+
+class _Handler(BaseHTTPRequestHandler):
+    corpus: Dict[str, List[List[str]]] = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: str, content_type: str = "text/html; charset=utf-8", status: int = 200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        parts = [p for p in parsed.path.split("/") if p]
+        host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+
+        # /<language>/html/?q=...&s=<offset>: DuckDuckGo-like result page
+        if len(parts) == 2 and parts[1] == "html":
+            language = parts[0]
+            offset = int(parse_qs(parsed.query).get("s", ["0"])[0])
+            links = []
+            if offset == 0:
+                links = [f'<a class="result__a" href="{host}/article/{language}/{i}">Result {i}</a>'
+                         for i in range(len(self.corpus.get(language, [])))]
+                # A page that extract_article_text rejects as too short
+                links.append(f'<a class="result__a" href="{host}/article/{language}/stub">Stub</a>')
+            return self._send(f"<html><body>{''.join(links)}</body></html>")
+
+        # /<language>/rss: Bing News-like RSS feed (fallback, empty)
+        if len(parts) == 2 and parts[1] == "rss":
+            return self._send('<?xml version="1.0"?><rss><channel></channel></rss>', "application/rss+xml")
+
+        # /article/<language>/<index>
+        if len(parts) == 3 and parts[0] == "article":
+            paragraphs = [] if parts[2] == "stub" else self.corpus.get(parts[1], [])[int(parts[2])]
+            body = "".join(f"<p>{p}</p>" for p in paragraphs)
+            return self._send(
+                f"<html><head><script>var x = 1;</script></head><body><nav><p>{'menu ' * 20}</p></nav>"
+                f"<article>{body}</article><footer><p>{'footer ' * 20}</p></footer></body></html>"
+            )
+
+        self._send("not found", status=404)
+
+
+def start_server(corpus: Dict[str, List[List[str]]]) -> ThreadingHTTPServer:
+    handler = type("Handler", (_Handler,), {"corpus": corpus})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- Tiny random models ---
+
+def write_tiny_models(corpus: Dict[str, List[List[str]]]) -> None:
+    """Writes tokenizers and randomly initialized small models under the relative model paths."""
+    import sentencepiece as spm
+    import torch
+    from tokenizers import ByteLevelBPETokenizer
+    from transformers import (
+        M2M100Config, M2M100ForConditionalGeneration, M2M100Tokenizer,
+        RobertaConfig, RobertaForSequenceClassification, RobertaTokenizerFast
+    )
+
+    torch.manual_seed(0)
+    texts = [p for articles in corpus.values() for article in articles for p in article]
+    texts.append(TOPIC)
+
+    # M2M100: sentencepiece model + vocab.json, as in the original checkpoint
+    os.makedirs(TRANSLATION_MODEL_PATH, exist_ok=True)
+    corpus_file = os.path.join(TRANSLATION_MODEL_PATH, "corpus.txt")
+    with open(corpus_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(texts))
+    spm_prefix = os.path.join(TRANSLATION_MODEL_PATH, "sentencepiece.bpe")
+    spm.SentencePieceTrainer.train(
+        input=corpus_file, model_prefix=spm_prefix, vocab_size=1000, model_type="bpe",
+        character_coverage=1.0, pad_id=-1, bos_id=-1, eos_id=-1, unk_id=0, minloglevel=2
+    )
+    processor = spm.SentencePieceProcessor(model_file=f"{spm_prefix}.model")
+    vocab = {"<s>": 0, "<pad>": 1, "</s>": 2, "<unk>": 3}
+    for i in range(processor.get_piece_size()):
+        vocab.setdefault(processor.id_to_piece(i), len(vocab))
+    with open(os.path.join(TRANSLATION_MODEL_PATH, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(vocab, f, ensure_ascii=False)
+    tokenizer = M2M100Tokenizer(
+        os.path.join(TRANSLATION_MODEL_PATH, "vocab.json"), f"{spm_prefix}.model"
+    )
+    tokenizer.save_pretrained(TRANSLATION_MODEL_PATH)
+    M2M100ForConditionalGeneration(M2M100Config(
+        # language tokens (__en__, ...) and the made-up words come after the sentencepiece vocabulary
+        vocab_size=max(tokenizer.lang_code_to_id.values()) + tokenizer.num_madeup_words + 1, d_model=64, encoder_layers=2, decoder_layers=2,
+        encoder_attention_heads=4, decoder_attention_heads=4, encoder_ffn_dim=128, decoder_ffn_dim=128,
+        max_position_embeddings=1024, pad_token_id=1, bos_token_id=0, eos_token_id=2, decoder_start_token_id=2
+    )).save_pretrained(TRANSLATION_MODEL_PATH)
+
+    # Encoders: one byte-level BPE tokenizer shared by all analyzers
+    bpe = ByteLevelBPETokenizer()
+    bpe.train_from_iterator(texts, vocab_size=2000, special_tokens=["<s>", "<pad>", "</s>", "<unk>", "<mask>"])
+    bpe_dir = tempfile.mkdtemp(prefix="bpe-")
+    bpe.save_model(bpe_dir)
+    encoder_tokenizer = RobertaTokenizerFast(
+        vocab_file=os.path.join(bpe_dir, "vocab.json"), merges_file=os.path.join(bpe_dir, "merges.txt")
+    )
+    for model_path, num_labels in ANALYZER_LABELS.items():
+        os.makedirs(model_path, exist_ok=True)
+        encoder_tokenizer.save_pretrained(model_path)
+        RobertaForSequenceClassification(RobertaConfig(
+            vocab_size=len(encoder_tokenizer), hidden_size=64, num_hidden_layers=2, num_attention_heads=4,
+            intermediate_size=128, max_position_embeddings=514, num_labels=num_labels
+        )).save_pretrained(model_path)
+
+
+# --- Measurement ---
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakRss:
+    """Samples the resident set size in a background thread while the block runs."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = _rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+
+def measure(name: str, fn: Callable[[], Dict], articles: int, tokens: int, repeat: int) -> Dict:
+    seconds, peaks = [], []
+    update = {}
+    for _ in range(repeat):
+        with PeakRss() as rss:
+            start = time.perf_counter()
+            update = fn()
+            seconds.append(time.perf_counter() - start)
+        peaks.append(rss.peak)
+    elapsed = statistics.median(seconds)
+    record = {
+        "name": name,
+        "seconds": round(elapsed, 4),
+        "articles": articles,
+        "articles_per_s": round(articles / elapsed, 2) if elapsed else None,
+        "tokens": tokens,
+        "tokens_per_s": round(tokens / elapsed, 1) if elapsed and tokens else None,
+        "peak_rss_mb": round(max(peaks) / 2**20, 1)
+    }
+    print(f"   {name:<32} {record['seconds']:>8.3f}s  {record['articles_per_s'] or 0:>9.2f} art/s  "
+          f"{record['tokens_per_s'] or 0:>10.1f} tok/s  {record['peak_rss_mb']:>8.1f} MB")
+    record["_update"] = update
+    return record
+
+
+def run_benchmark(args) -> Dict:
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
+
+    from graph.fetcher import configure_fetcher
+    from graph.graph_builder import ANALYZER_NODES, build_graph
+    from graph.http_cache import configure_http_cache
+    from graph.model_registry import get_model
+    from graph.nodes.display_results_node import display_results_node
+    from graph.nodes.save_final_state_node import save_final_state_node
+    from graph.nodes.scrape_node import configure_search_endpoints, scrape_node_factory
+    from graph.nodes.sentiment.encoder_inference import clear_tokenization_cache
+    from graph.nodes.translate_to_en_node import split_into_sentences, translate_to_en_node
+    from graph.nodes.translate_to_multiple_node import translate_to_multiple_node
+    from graph.results_store import ResultsStore, merge_results
+    from graph.translation import encode_source
+    from graph.translation_cache import configure_translation_cache
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+
+    corpus = build_corpus(languages, args.articles, args.seed)
+    print("🧪 Writing tiny random models...")
+    write_tiny_models(corpus)
+    server = start_server(corpus)
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # Measure the code paths, not the caches or the politeness delay
+    configure_search_endpoints(f"{host}/{{language}}/html/", f"{host}/{{language}}/rss?q={{query}}")
+    configure_fetcher(per_host_interval=0.0)
+    configure_http_cache(enabled=False)
+    configure_translation_cache(enabled=False)
+
+    steps: List[Dict] = []
+    load_start = time.perf_counter()
+    translation_tokenizer, _, _ = get_model(TRANSLATION_MODEL_PATH, M2M100ForConditionalGeneration, M2M100Tokenizer)
+    encoder_tokenizer = None
+    for model_path in ANALYZER_LABELS:
+        encoder_tokenizer, _, _ = get_model(model_path, AutoModelForSequenceClassification, AutoTokenizer, trust_remote_code=True)
+    print(f"   models loaded in {time.perf_counter() - load_start:.2f}s\n")
+
+    state = {
+        "run_id": "benchmark",
+        "input_text": [{"language": "en", "text": TOPIC}],
+        "selected_languages": languages,
+        "raw_articles": [],
+        "translated_articles": [],
+        "results": ResultsStore(),
+        "duplicates": {},
+        "count_duplicates": True,
+        "summary": "",
+        "num_articles": args.articles
+    }
+
+    print("⏱ Nodes:")
+    record = measure("translate_to_many", lambda: translate_to_multiple_node(state), 0,
+                     len(translation_tokenizer(TOPIC)["input_ids"]) * len(languages), args.repeat)
+    state.update(record.pop("_update"))
+    steps.append(record)
+
+    for language in languages:
+        node = scrape_node_factory(language)
+        record = measure(f"scrape_{language}", lambda: node(state), args.articles, 0, args.repeat)
+        state["raw_articles"] = state["raw_articles"] + record.pop("_update").get("raw_articles", [])
+        steps.append(record)
+
+    source_tokens = 0
+    for article in state["raw_articles"]:
+        if article["language"] != "en":
+            source_tokens += sum(
+                len(encode_source(translation_tokenizer, s, article["language"])) for s in split_into_sentences(article["text"])
+            )
+    record = measure("translate_articles", lambda: translate_to_en_node(state), len(state["raw_articles"]), source_tokens, args.repeat)
+    update = record.pop("_update")
+    state["translated_articles"] = update.get("translated_articles", [])
+    state["duplicates"] = update.get("duplicates", {})
+    steps.append(record)
+
+    encoder_tokens = sum(len(encoder_tokenizer(a["text_en"])["input_ids"]) for a in state["translated_articles"])
+    for node_name, node_fn in ANALYZER_NODES:
+        def run_analyzer(node_fn=node_fn):
+            clear_tokenization_cache()
+            return node_fn(state)
+        record = measure(node_name, run_analyzer, len(state["translated_articles"]), encoder_tokens, args.repeat)
+        state["results"] = merge_results(state["results"], record.pop("_update").get("results"))
+        steps.append(record)
+
+    for name, node_fn in [("save_final_state_node", save_final_state_node), ("display_results", display_results_node)]:
+        record = measure(name, lambda: node_fn(state) or {}, len(state["raw_articles"]), 0, args.repeat)
+        record.pop("_update")
+        steps.append(record)
+
+    print("\n⏱ Graph (build_graph + invoke):")
+    initial_state = {**state, "raw_articles": [], "translated_articles": [], "results": ResultsStore(), "duplicates": {}}
+
+    def run_graph():
+        clear_tokenization_cache()
+        return build_graph(initial_state).invoke(initial_state)
+
+    graph_record = measure("graph", run_graph, len(languages) * args.articles, 0, args.repeat)
+    graph_record.pop("_update")
+    server.shutdown()
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "platform": platform.platform(),
+            "threads": torch.get_num_threads(),
+            "languages": languages,
+            "articles_per_language": args.articles,
+            "repeat": args.repeat,
+            "seed": args.seed
+        },
+        "nodes": steps,
+        "graph": graph_record
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Steps whose throughput dropped (or time grew, for steps without articles) by more than tolerance."""
+    regressions = []
+    previous = {step["name"]: step for step in baseline.get("nodes", []) + [baseline.get("graph", {})] if step}
+    for step in current["nodes"] + [current["graph"]]:
+        old = previous.get(step["name"])
+        if not old:
+            continue
+        if step.get("articles_per_s") and old.get("articles_per_s"):
+            if step["articles_per_s"] < old["articles_per_s"] * (1 - tolerance):
+                regressions.append(f"{step['name']}: {old['articles_per_s']} -> {step['articles_per_s']} articles/s")
+        elif step["seconds"] > old["seconds"] * (1 + tolerance):
+            regressions.append(f"{step['name']}: {old['seconds']}s -> {step['seconds']}s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--languages", default="de,pl,en", help="Comma-separated languages (default: de,pl,en).")
+    parser.add_argument("--articles", type=int, default=8, help="Synthetic articles per language (default: 8).")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per step; the median time is reported (default: 1).")
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads (default: torch default).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=None, help="Directory for models and outputs (default: a temporary one).")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--trace", help="Also write a Chrome trace of the whole benchmark to this file.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against an earlier --output file.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown for --compare (default: 0.2).")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    trace = os.path.abspath(args.trace) if args.trace else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="clsa-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    print(f"📂 Working directory: {workdir}")
+
+    from graph.tracing import configure_tracing, tracer
+    configure_tracing(enabled=trace is not None)
+
+    results = run_benchmark(args)
+
+    if trace:
+        tracer.export_chrome_trace(trace)
+        print(f"\n🧭 Trace written to {trace}")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ Regressions:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print("\n✅ No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
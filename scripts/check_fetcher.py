@@ -0,0 +1,168 @@
+"""
+Regression checks of AsyncFetcher against a local HTTP server (offline).
+
+- a page sent in many small writes (with Content-Length, and with chunked transfer
+  encoding) must arrive complete, not cut to the first network chunk
+- a page larger than MAX_DOWNLOAD_BYTES must be cut to exactly that size
+- one fetcher shared by several threads (batch mode) must not hold more than
+  max_connections connections to the server at once
+
+Exits with status 1 when a check fails.
+
+Usage:
+    python scripts/check_fetcher.py
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph.extraction import MAX_DOWNLOAD_BYTES
+from graph.fetcher import AsyncFetcher
+from graph.http_cache import configure_http_cache
+
+WRITE_BYTES = 8 * 1024
+PAGE_BYTES = 357_014
+SLOW_SECONDS = 0.2
+MAX_CONNECTIONS = 3
+CALLER_THREADS = 4
+
+
+def make_page(size: int) -> bytes:
+    paragraph = b"<p>" + b"Negotiators met again on Thursday to discuss the draft agreement. " * 4 + b"</p>\n"
+    head, tail = b"<html><body><article>\n", b"</article></body></html>\n"
+    body = head + paragraph * ((size - len(head) - len(tail)) // len(paragraph) + 1)
+    return body[:size - len(tail)] + tail
+
+
+PAGES = {
+    "/page": make_page(PAGE_BYTES),
+    "/chunked": make_page(PAGE_BYTES),
+    "/large": make_page(MAX_DOWNLOAD_BYTES + 300_000)
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = {"open": 0, "peak": 0}
+    connections_lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    # One handler instance per TCP connection (HTTP/1.1 keep-alive serves many requests)
+    def setup(self):
+        super().setup()
+        with self.connections_lock:
+            self.connections["open"] += 1
+            self.connections["peak"] = max(self.connections["peak"], self.connections["open"])
+
+    def finish(self):
+        with self.connections_lock:
+            self.connections["open"] -= 1
+        super().finish()
+
+    def do_GET(self):
+        if self.path.startswith("/slow/"):
+            time.sleep(SLOW_SECONDS)
+            body = PAGES["/page"][:4096]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        body = PAGES.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        chunked = self.path == "/chunked"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            for start in range(0, len(body), WRITE_BYTES):
+                part = body[start:start + WRITE_BYTES]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part) if chunked else part)
+                self.wfile.flush()
+                time.sleep(0.001)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the fetcher stops reading at MAX_DOWNLOAD_BYTES
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def check_body_sizes(host: str) -> List[Tuple[str, bool, str]]:
+    fetcher = AsyncFetcher(per_host_interval=0.0, timeout=30.0)
+    expected = {
+        "/page": len(PAGES["/page"]),
+        "/chunked": len(PAGES["/chunked"]),
+        "/large": MAX_DOWNLOAD_BYTES
+    }
+    results = []
+    for path, size in expected.items():
+        fetched = fetcher.collect([f"{host}{path}"], lambda body: body, needed=1)
+        got = len(fetched[0][1].encode("utf-8")) if fetched else 0
+        results.append((f"body size {path}", got == size, f"{got:,} bytes, expected {size:,}"))
+    fetcher.close()
+    return results
+
+
+def check_shared_pool(host: str) -> List[Tuple[str, bool, str]]:
+    fetcher = AsyncFetcher(max_connections=MAX_CONNECTIONS, per_host_interval=0.0, timeout=30.0)
+    _Handler.connections["peak"] = _Handler.connections["open"]
+
+    def collect(caller: int) -> int:
+        urls = [f"{host}/slow/{caller}-{i}" for i in range(3 * MAX_CONNECTIONS)]
+        return len(fetcher.collect(urls, lambda body: body, needed=len(urls)))
+
+    with ThreadPoolExecutor(max_workers=CALLER_THREADS) as pool:
+        fetched = sum(pool.map(collect, range(CALLER_THREADS)))
+    fetcher.close()
+    expected = CALLER_THREADS * 3 * MAX_CONNECTIONS
+    peak = _Handler.connections["peak"]
+    return [
+        ("shared pool pages", fetched == expected, f"{fetched} pages, expected {expected}"),
+        ("shared pool connections", peak <= MAX_CONNECTIONS,
+         f"at most {peak} connections at once from {CALLER_THREADS} threads, limit {MAX_CONNECTIONS}")
+    ]
+
+
+def main():
+    # Every page has to come from the server, not from an earlier run's cache
+    configure_http_cache(enabled=False)
+    server = start_server()
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+
+    results = check_body_sizes(host) + check_shared_pool(host)
+    server.shutdown()
+
+    for name, ok, detail in results:
+        print(f"   {'✅' if ok else '❌'} {name}: {detail}")
+    failed = [name for name, ok, _ in results if not ok]
+    if failed:
+        print(f"\n❌ Fetcher checks failed: {', '.join(failed)}")
+        sys.exit(1)
+    print("\n✅ All fetcher checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Compares the int8 quantized encoder analyzers with fp32 on a fixed article set (CPU).
+
+For every analyzer model it reports the per-label absolute drift of the averaged
+probabilities, how often the top label agrees, and the speedup of the int8 forward
+passes. Exits with status 1 when any label drifts more than --max-drift.
+
+Usage:
+    python scripts/check_quantization.py
+    python scripts/check_quantization.py --articles output/runs/<RUN_ID>/articles.ndjson --output drift.json
+    python scripts/check_quantization.py --models unitary/toxic-bert --max-drift 0.03
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from graph.model_registry import get_model
+from graph.nodes.sentiment.encoder_inference import classify_articles, clear_tokenization_cache
+from graph.quantization import configure_quantization
+from graph.run_output import read_ndjson
+
+# Model path -> activation, as used by the analyzer nodes
+ANALYZER_MODELS = {
+    "models/encoders/twitter-roberta-base-sentiment-latest": "softmax",
+    "unitary/toxic-bert": "sigmoid",
+    "j-hartmann/emotion-english-distilroberta-base": "softmax",
+    "cardiffnlp/twitter-roberta-base-irony": "softmax",
+    "cointegrated/roberta-base-formality": "softmax",
+    "GroNLP/mdebertav3-subjectivity-english": "softmax",
+    "IDA-SERICS/PropagandaDetection": "softmax"
+}
+
+FIXED_ARTICLES = [
+    "The central bank kept interest rates unchanged on Thursday, saying inflation had eased but remained above its target. Analysts expect a first cut early next year.",
+    "Thousands of people marched through the capital to protest against the new pension law, which raises the retirement age by two years. Police reported several arrests.",
+    "The two leaders signed a trade agreement that removes tariffs on agricultural products. Both governments called the deal a historic step towards closer cooperation.",
+    "Oh great, another delayed train. Passengers have now waited three hours for a service that was promised to be the fastest in the country.",
+    "Rescue teams are still searching for survivors after the earthquake destroyed hundreds of homes in the mountain villages. The death toll rose to 85 overnight.",
+    "The enemy's lies will never break the spirit of our glorious nation, which stands united against those who want to destroy everything we hold dear.",
+    "Researchers presented a new battery design that charges in ten minutes and lasts twice as long as current cells. Production is planned to start in 2026.",
+    "The opposition accused the minister of hiding the true cost of the project. The ministry rejected the claims as baseless and politically motivated.",
+    "Fans celebrated late into the night after the national team won the championship for the first time in forty years.",
+    "Heavy rain caused flooding in several districts, closing schools and roads. Authorities urged residents to avoid unnecessary travel.",
+    "I am disgusted by the way these so-called experts keep treating ordinary people like idiots who cannot think for themselves.",
+    "The company announced it will cut 2,000 jobs as part of a restructuring plan, sending its shares up by six percent."
+]
+
+
+def load_articles(path: str = None, limit: int = 50) -> list:
+    if not path:
+        texts = FIXED_ARTICLES
+    else:
+        texts = [r.get("text_en") or r.get("text", "") for r in read_ndjson(path)]
+        texts = [t for t in texts if t.strip()][:limit]
+    return [{"article_id": f"check-{i:04d}", "source_language": "en", "text_en": t} for i, t in enumerate(texts)]
+
+
+def run_model(model_path: str, activation: str, articles: list, quantize: bool):
+    tokenizer, model, device = get_model(
+        model_path, AutoModelForSequenceClassification, AutoTokenizer,
+        device="cpu", quantize=quantize, trust_remote_code=True
+    )
+    labels = [model.config.id2label[i] for i in range(model.config.num_labels)]
+    clear_tokenization_cache()
+    start = time.perf_counter()
+    scores = classify_articles(tokenizer, model, device, articles, activation=activation)
+    elapsed = time.perf_counter() - start
+    return labels, torch.stack(scores), elapsed
+
+
+def compare_model(model_path: str, activation: str, articles: list) -> dict:
+    labels, fp32, fp32_seconds = run_model(model_path, activation, articles, quantize=False)
+    _, int8, int8_seconds = run_model(model_path, activation, articles, quantize=True)
+    drift = (int8 - fp32).abs()
+    return {
+        "model": model_path,
+        "articles": len(articles),
+        "max_drift": round(float(drift.max()), 5),
+        "mean_drift": round(float(drift.mean()), 5),
+        "per_label_max_drift": {label: round(float(drift[:, i].max()), 5) for i, label in enumerate(labels)},
+        "top_label_agreement": round(float((fp32.argmax(dim=1) == int8.argmax(dim=1)).float().mean()), 4),
+        "fp32_seconds": round(fp32_seconds, 4),
+        "int8_seconds": round(int8_seconds, 4),
+        "speedup": round(fp32_seconds / int8_seconds, 2) if int8_seconds else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", help="NDJSON articles (e.g. a run's articles.ndjson); default: built-in fixed set.")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum articles read from --articles (default: 50).")
+    parser.add_argument("--models", help="Comma-separated model paths (default: all analyzers).")
+    parser.add_argument("--max-drift", type=float, default=0.05, help="Largest accepted absolute probability drift (default: 0.05).")
+    parser.add_argument("--output", help="Write the report as JSON to this file.")
+    args = parser.parse_args()
+
+    configure_quantization(enabled=True)
+    articles = load_articles(args.articles, args.limit)
+    models = [m.strip() for m in args.models.split(",")] if args.models else list(ANALYZER_MODELS)
+
+    report = []
+    for model_path in models:
+        print(f"\n🔬 {model_path}")
+        entry = compare_model(model_path, ANALYZER_MODELS.get(model_path, "softmax"), articles)
+        report.append(entry)
+        print(f"\n   max drift {entry['max_drift']:.4f}, mean drift {entry['mean_drift']:.4f}, "
+              f"top label agreement {entry['top_label_agreement']:.0%}, speedup x{entry['speedup']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"max_drift_allowed": args.max_drift, "models": report}, f, indent=2)
+        print(f"\n✅ Report written to {args.output}")
+
+    failed = [entry["model"] for entry in report if entry["max_drift"] > args.max_drift]
+    if failed:
+        print(f"\n❌ Drift above {args.max_drift} for: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\n✅ All models within {args.max_drift} of fp32.")
+
+
+if __name__ == "__main__":
+    main()
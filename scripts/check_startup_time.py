@@ -0,0 +1,116 @@
+"""
+Startup-time budget of the CLI fast path.
+
+Runs `python -X importtime run_clsa.py --help` and an invocation with a missing
+argument in fresh interpreters and reports the import time (median over --repeat
+runs), the wall time and the slowest imports. Heavy stacks (torch, transformers,
+bs4, requests, langgraph, ...) must only be imported once a node runs, so the
+script exits with status 1 when any of them is imported on this path, or when the
+median import time exceeds --budget-ms.
+
+Usage:
+    python scripts/check_startup_time.py
+    python scripts/check_startup_time.py --budget-ms 500 --repeat 7 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = (
+    "torch", "transformers", "bs4", "requests", "langgraph", "aiohttp", "onnxruntime", "ctranslate2"
+)
+
+# (label, arguments of run_clsa.py)
+INVOCATIONS = [
+    ("help", ["--help"]),
+    ("argument_error", ["--text", "Climate summit"])
+]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, depth, self µs, cumulative µs) for every line of -X importtime output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return imports
+
+
+def run_once(args: List[str]) -> Dict:
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "run_clsa.py", *args],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    imports = parse_importtime(completed.stderr)
+    top_level = [entry for entry in imports if entry[1] == 0]
+    return {
+        "exit_code": completed.returncode,
+        "wall_ms": wall * 1000,
+        "import_ms": sum(cumulative for _, _, _, cumulative in top_level) / 1000,
+        "top_level": top_level,
+        "heavy": sorted({name.split(".")[0] for name, _, _, _ in imports if name.split(".")[0] in HEAVY_MODULES})
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Largest accepted median import time in ms (default: 1000).")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per invocation; the median is reported (default: 5).")
+    parser.add_argument("--top", type=int, default=8, help="Number of slowest top-level imports to list (default: 8).")
+    parser.add_argument("--output", help="Write the report as JSON to this file.")
+    args = parser.parse_args()
+
+    report, failed = [], []
+    for label, cli_args in INVOCATIONS:
+        runs = [run_once(cli_args) for _ in range(max(1, args.repeat))]
+        slowest = sorted(runs[-1]["top_level"], key=lambda entry: entry[3], reverse=True)[:args.top]
+        entry = {
+            "invocation": label,
+            "args": cli_args,
+            "exit_code": runs[-1]["exit_code"],
+            "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+            "wall_ms": round(statistics.median(run["wall_ms"] for run in runs), 1),
+            "heavy_modules": sorted({name for run in runs for name in run["heavy"]}),
+            "slowest_imports": [{"module": name, "cumulative_ms": round(cumulative / 1000, 1)} for name, _, _, cumulative in slowest]
+        }
+        report.append(entry)
+
+        print(f"\n⏱ run_clsa.py {' '.join(cli_args)}  (exit {entry['exit_code']})")
+        print(f"   imports {entry['import_ms']:.1f} ms  wall {entry['wall_ms']:.1f} ms  (median of {len(runs)})")
+        for item in entry["slowest_imports"]:
+            print(f"   {item['cumulative_ms']:>8.1f} ms  {item['module']}")
+
+        if entry["heavy_modules"]:
+            print(f"   ❌ Heavy modules imported: {', '.join(entry['heavy_modules'])}")
+            failed.append(label)
+        elif entry["import_ms"] > args.budget_ms:
+            print(f"   ❌ Import time above the budget of {args.budget_ms:.0f} ms")
+            failed.append(label)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"budget_ms": args.budget_ms, "results": report}, f, indent=2)
+        print(f"\n✅ Report written to {args.output}")
+
+    if failed:
+        print(f"\n❌ Startup budget exceeded for: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\n✅ CLI startup within {args.budget_ms:.0f} ms and free of heavy imports.")
+
+
+if __name__ == "__main__":
+    main()
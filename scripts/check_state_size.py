@@ -0,0 +1,106 @@
+"""
+Regression check: the final graph state grows linearly in languages x articles.
+
+Runs the compiled graph (build_graph) offline for several (L languages, A articles)
+sizes, with the local stand-in server and tiny random models of
+benchmark_pipeline.py, and checks the reducer channels of the final state:
+- input_text: the English topic plus one query per other language
+- raw_articles and translated_articles: exactly L*A entries with unique IDs
+- results: exactly L*A rows per analyzer
+A node that returns the whole state instead of its delta re-appends every list to
+itself and fails the check. Exits with status 1 on any mismatch.
+
+Usage:
+    python scripts/check_state_size.py
+    python scripts/check_state_size.py --sizes 1x2,3x3,4x5 --workdir /tmp/clsa-check
+"""
+import argparse
+import os
+import sys
+import tempfile
+from typing import List, Tuple
+
+from benchmark_pipeline import build_corpus, start_server, write_tiny_models
+
+LANGUAGES = ["en", "de", "pl", "fr"]
+
+
+def parse_sizes(text: str) -> List[Tuple[int, int]]:
+    sizes = []
+    for item in text.split(","):
+        languages, articles = item.lower().split("x")
+        sizes.append((int(languages), int(articles)))
+    return sizes
+
+
+def check_size(languages: List[str], articles: int) -> List[str]:
+    from graph.graph_builder import ANALYZER_NODES, build_graph
+    from graph.results_store import as_results_store
+    from graph.state_definitions import new_run_state
+
+    state = new_run_state(f"state-size-{len(languages)}x{articles}", "Climate summit", languages, articles)
+    final_state = build_graph(state).invoke(state)
+
+    expected = len(languages) * articles
+    raw_ids = [a["article_id"] for a in final_state["raw_articles"]]
+    translated_ids = [a["article_id"] for a in final_state["translated_articles"]]
+    results = as_results_store(final_state["results"])
+    counts = {
+        "input_text": (len(final_state["input_text"]), 1 + sum(lang != "en" for lang in languages)),
+        "raw_articles": (len(raw_ids), expected),
+        "unique raw IDs": (len(set(raw_ids)), expected),
+        "translated_articles": (len(translated_ids), expected),
+        "unique translated IDs": (len(set(translated_ids)), expected),
+        "results": (len(results), expected * len(ANALYZER_NODES))
+    }
+    return [f"{name}: {got} (expected {want})" for name, (got, want) in counts.items() if got != want]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1x2,2x2,2x4,4x3", help=f"Comma-separated LxA sizes, L <= {len(LANGUAGES)} (default: 1x2,2x2,2x4,4x3).")
+    parser.add_argument("--workdir", default=None, help="Directory for models and outputs (default: a temporary one).")
+    args = parser.parse_args()
+
+    sizes = parse_sizes(args.sizes)
+    if any(not 1 <= languages <= len(LANGUAGES) or articles < 1 for languages, articles in sizes):
+        parser.error(f"sizes must be LxA with 1 <= L <= {len(LANGUAGES)} and A >= 1")
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="clsa-state-size-")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    print(f"📂 Working directory: {workdir}")
+
+    from graph.fetcher import configure_fetcher
+    from graph.http_cache import configure_http_cache
+    from graph.nodes.scrape_node import configure_search_endpoints
+    from graph.translation_cache import configure_translation_cache
+
+    corpus = build_corpus(LANGUAGES, max(articles for _, articles in sizes), seed=0)
+    print("🧪 Writing tiny random models...")
+    write_tiny_models(corpus)
+    server = start_server(corpus)
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    configure_search_endpoints(f"{host}/{{language}}/html/", f"{host}/{{language}}/rss?q={{query}}")
+    configure_fetcher(per_host_interval=0.0)
+    configure_http_cache(enabled=False)
+    configure_translation_cache(enabled=False)
+
+    failures = []
+    for num_languages, articles in sizes:
+        problems = check_size(LANGUAGES[:num_languages], articles)
+        label = f"{num_languages}x{articles}"
+        print(f"\n{'✅' if not problems else '❌'} L x A = {label}")
+        for problem in problems:
+            print(f"   {problem}")
+        if problems:
+            failures.append(label)
+
+    if failures:
+        print(f"\n❌ State size not linear in L x A for: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Final state size is linear in L x A for every size.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Parity check and benchmark of the ONNX Runtime backend against PyTorch for the
+encoder analyzers (CPU). Every model runs classify_articles on the same articles
+with each backend. The script reports the largest per-label probability difference
+from PyTorch fp32, top-label agreement and the median time of the forward passes.
+Exits with status 1 when the fp32 ONNX model differs more than --max-diff.
+
+Usage:
+    python scripts/compare_backends.py
+    python scripts/compare_backends.py --int8 --repeat 5 --output backends.json
+    python scripts/compare_backends.py --articles output/runs/<RUN_ID>/articles.ndjson --models unitary/toxic-bert
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from check_quantization import ANALYZER_MODELS, load_articles
+from graph.model_registry import get_model
+from graph.nodes.sentiment.encoder_inference import classify_articles, clear_tokenization_cache
+from graph.onnx_backend import configure_backend
+from graph.quantization import configure_quantization
+
+
+def run_variant(model_path: str, activation: str, articles: list, backend: str, int8: bool, repeat: int):
+    configure_backend(backend)
+    configure_quantization(enabled=int8)
+    tokenizer, model, device = get_model(
+        model_path, AutoModelForSequenceClassification, AutoTokenizer,
+        device="cpu", quantize=True, onnx=True, trust_remote_code=True
+    )
+    seconds = []
+    for _ in range(repeat):
+        clear_tokenization_cache()
+        start = time.perf_counter()
+        scores = classify_articles(tokenizer, model, device, articles, activation=activation)
+        seconds.append(time.perf_counter() - start)
+    return torch.stack(scores), statistics.median(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", help="NDJSON articles (e.g. a run's articles.ndjson); default: built-in fixed set.")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum articles read from --articles (default: 50).")
+    parser.add_argument("--models", help="Comma-separated model paths (default: all analyzers).")
+    parser.add_argument("--int8", action="store_true", help="Also compare the int8 variants of both backends.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per variant; the median is reported (default: 3).")
+    parser.add_argument("--max-diff", type=float, default=1e-3, help="Largest accepted fp32 ONNX vs PyTorch difference (default: 0.001).")
+    parser.add_argument("--output", help="Write the report as JSON to this file.")
+    args = parser.parse_args()
+
+    articles = load_articles(args.articles, args.limit)
+    models = [m.strip() for m in args.models.split(",")] if args.models else list(ANALYZER_MODELS)
+    variants = [("torch", False), ("onnx", False)] + ([("torch", True), ("onnx", True)] if args.int8 else [])
+
+    report = []
+    for model_path in models:
+        print(f"\n🔬 {model_path}")
+        activation = ANALYZER_MODELS.get(model_path, "softmax")
+        reference, reference_seconds = None, None
+        for backend, int8 in variants:
+            scores, seconds = run_variant(model_path, activation, articles, backend, int8, args.repeat)
+            if reference is None:
+                reference, reference_seconds = scores, seconds
+            diff = (scores - reference).abs()
+            entry = {
+                "model": model_path,
+                "backend": backend,
+                "int8": int8,
+                "articles": len(articles),
+                "seconds": round(seconds, 4),
+                "speedup_vs_torch_fp32": round(reference_seconds / seconds, 2) if seconds else None,
+                "max_diff": round(float(diff.max()), 6),
+                "top_label_agreement": round(float((scores.argmax(dim=1) == reference.argmax(dim=1)).float().mean()), 4)
+            }
+            report.append(entry)
+            print(f"\n   {backend:<5} {'int8' if int8 else 'fp32'}  {entry['seconds']:.4f}s  x{entry['speedup_vs_torch_fp32']}  "
+                  f"max diff {entry['max_diff']:.6f}  top label agreement {entry['top_label_agreement']:.0%}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"max_diff_allowed": args.max_diff, "results": report}, f, indent=2)
+        print(f"\n✅ Report written to {args.output}")
+
+    failed = [e["model"] for e in report if e["backend"] == "onnx" and not e["int8"] and e["max_diff"] > args.max_diff]
+    if failed:
+        print(f"\n❌ ONNX output differs from PyTorch by more than {args.max_diff} for: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\n✅ ONNX fp32 within {args.max_diff} of PyTorch for all models.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Quality and speed comparison of the translation engines on a fixed sentence set (CPU).
+
+Every engine translates the same news sentences (German, French, Spanish, Polish and
+Russian) to English with the decoding settings of translate_to_en_node. The script
+reports chrF against the reference translations, chrF and exact-match agreement with
+the transformers engine, and the median translation time. Exits with status 1 when an
+engine scores more than --max-chrf-drop chrF points below the transformers engine.
+
+Usage:
+    python scripts/compare_translation_engines.py
+    python scripts/compare_translation_engines.py --compute-types int8,float32 --repeat 3 --output engines.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
+
+from graph.translation import translate_sentences
+from graph.translation_cache import configure_translation_cache
+from graph.translation_engine import configure_translation_engine, get_translation_engine
+
+MODEL_PATH = "models/translation/m2m100_418M"
+
+# (source sentence, English reference) per source language
+FIXED_SENTENCES = {
+    "de": [
+        ("Die Zentralbank hat die Zinsen am Donnerstag unverändert gelassen.", "The central bank left interest rates unchanged on Thursday."),
+        ("Tausende Menschen protestierten in der Hauptstadt gegen das neue Rentengesetz.", "Thousands of people protested in the capital against the new pension law."),
+        ("Die Rettungskräfte suchen weiter nach Überlebenden des Erdbebens.", "Rescue workers are still searching for survivors of the earthquake."),
+        ("Das Unternehmen kündigte an, 2.000 Stellen zu streichen.", "The company announced that it will cut 2,000 jobs.")
+    ],
+    "fr": [
+        ("Les deux dirigeants ont signé un accord commercial historique.", "The two leaders signed a historic trade agreement."),
+        ("De fortes pluies ont provoqué des inondations dans plusieurs quartiers.", "Heavy rain caused flooding in several districts."),
+        ("L'opposition accuse le ministre de cacher le coût réel du projet.", "The opposition accuses the minister of hiding the real cost of the project."),
+        ("Les supporters ont fêté la victoire de l'équipe nationale jusque tard dans la nuit.", "Fans celebrated the national team's victory late into the night.")
+    ],
+    "es": [
+        ("El gobierno aprobó un nuevo presupuesto para la educación pública.", "The government approved a new budget for public education."),
+        ("Los investigadores presentaron una batería que se carga en diez minutos.", "The researchers presented a battery that charges in ten minutes."),
+        ("La inflación bajó por tercer mes consecutivo.", "Inflation fell for the third consecutive month."),
+        ("Miles de pasajeros quedaron atrapados por la huelga de los controladores aéreos.", "Thousands of passengers were stranded by the air traffic controllers' strike.")
+    ],
+    "pl": [
+        ("Rząd zapowiedział obniżkę podatków dla małych firm.", "The government announced tax cuts for small businesses."),
+        ("W wyniku powodzi ewakuowano mieszkańców kilku wsi.", "Residents of several villages were evacuated due to the flood."),
+        ("Prezydent spotkał się z przywódcami państw sąsiednich.", "The president met with the leaders of neighbouring countries."),
+        ("Ceny energii wzrosły o dziesięć procent w ciągu roku.", "Energy prices rose by ten percent within a year.")
+    ],
+    "ru": [
+        ("Правительство объявило о новых мерах поддержки экономики.", "The government announced new measures to support the economy."),
+        ("Сильный снегопад парализовал движение в городе.", "Heavy snowfall paralyzed traffic in the city."),
+        ("Учёные обнаружили новый вид птиц в горах.", "Scientists discovered a new species of bird in the mountains."),
+        ("Переговоры между сторонами продолжатся на следующей неделе.", "Talks between the parties will continue next week.")
+    ]
+}
+
+
+def char_ngrams(text: str, n: int) -> Counter:
+    text = " ".join(text.split())
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def chrf(hypotheses: List[str], references: List[str], max_order: int = 6, beta: float = 2.0) -> float:
+    """Corpus-level chrF (character n-gram F-score, n = 1..6, beta = 2) in points (0-100)."""
+    matches, hyp_total, ref_total = [0] * max_order, [0] * max_order, [0] * max_order
+    for hypothesis, reference in zip(hypotheses, references):
+        for n in range(1, max_order + 1):
+            hyp, ref = char_ngrams(hypothesis, n), char_ngrams(reference, n)
+            matches[n - 1] += sum((hyp & ref).values())
+            hyp_total[n - 1] += sum(hyp.values())
+            ref_total[n - 1] += sum(ref.values())
+
+    precisions = [m / h for m, h in zip(matches, hyp_total) if h]
+    recalls = [m / r for m, r in zip(matches, ref_total) if r]
+    precision = sum(precisions) / max_order if precisions else 0.0
+    recall = sum(recalls) / max_order if recalls else 0.0
+    if precision + recall == 0:
+        return 0.0
+    return 100 * (1 + beta ** 2) * precision * recall / (beta ** 2 * precision + recall)
+
+
+def run_engine(engine_name: str, compute_type: str, repeat: int) -> Dict:
+    configure_translation_engine(engine_name, compute_type=compute_type)
+    tokenizer, engine = get_translation_engine(MODEL_PATH, M2M100ForConditionalGeneration, M2M100Tokenizer)
+
+    seconds, translations = [], {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for lang, pairs in FIXED_SENTENCES.items():
+            translations[lang] = translate_sentences(tokenizer, engine, [source for source, _ in pairs], lang, "en")
+        seconds.append(time.perf_counter() - start)
+    return {"translations": translations, "seconds": statistics.median(seconds)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--compute-types", default="int8", help="Comma-separated CTranslate2 compute types (default: int8).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per engine; the median is reported (default: 3).")
+    parser.add_argument("--max-chrf-drop", type=float, default=2.0, help="Largest accepted chrF drop against the transformers engine (default: 2.0).")
+    parser.add_argument("--output", help="Write the report as JSON to this file.")
+    args = parser.parse_args()
+
+    # Every sentence has to go through the engine, not the translation memory
+    configure_translation_cache(enabled=False)
+
+    sources = [source for pairs in FIXED_SENTENCES.values() for source, _ in pairs]
+    references = [reference for pairs in FIXED_SENTENCES.values() for _, reference in pairs]
+    variants = [("hf", "float32")] + [("ctranslate2", c.strip()) for c in args.compute_types.split(",") if c.strip()]
+
+    report, baseline = [], None
+    for engine_name, compute_type in variants:
+        label = engine_name if engine_name == "hf" else f"{engine_name}-{compute_type}"
+        print(f"\n🔬 {label}")
+        result = run_engine(engine_name, compute_type, args.repeat)
+        hypotheses = [text for lang in FIXED_SENTENCES for text in result["translations"][lang]]
+        if baseline is None:
+            baseline = {"hypotheses": hypotheses, "seconds": result["seconds"]}
+
+        entry = {
+            "engine": label,
+            "sentences": len(sources),
+            "seconds": round(result["seconds"], 4),
+            "sentences_per_s": round(len(sources) / result["seconds"], 2) if result["seconds"] else None,
+            "speedup_vs_hf": round(baseline["seconds"] / result["seconds"], 2) if result["seconds"] else None,
+            "chrf": round(chrf(hypotheses, references), 2),
+            "chrf_vs_hf": round(chrf(hypotheses, baseline["hypotheses"]), 2),
+            "exact_match_vs_hf": round(sum(a == b for a, b in zip(hypotheses, baseline["hypotheses"])) / len(sources), 4),
+            "translations": {lang: result["translations"][lang] for lang in FIXED_SENTENCES}
+        }
+        report.append(entry)
+        print(f"\n   {entry['seconds']:.3f}s  {entry['sentences_per_s']} sent/s  x{entry['speedup_vs_hf']}  "
+              f"chrF {entry['chrf']:.2f}  chrF vs hf {entry['chrf_vs_hf']:.2f}  identical to hf {entry['exact_match_vs_hf']:.0%}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"max_chrf_drop_allowed": args.max_chrf_drop, "results": report}, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Report written to {args.output}")
+
+    reference_chrf = report[0]["chrf"]
+    failed = [e["engine"] for e in report[1:] if reference_chrf - e["chrf"] > args.max_chrf_drop]
+    if failed:
+        print(f"\n❌ chrF more than {args.max_chrf_drop} points below the transformers engine for: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\n✅ All engines within {args.max_chrf_drop} chrF points of the transformers engine.")
+
+
+if __name__ == "__main__":
+    main()